@@ -1,5 +1,5 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException, Header, Query, APIRouter
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, APIRouter, BackgroundTasks
 from fastapi.security.api_key import APIKeyHeader
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, List, Any, Union
@@ -7,6 +7,7 @@ import os
 from dotenv import load_dotenv
 from enum import Enum
 from nodeless import PaymentHandler
+from breez_sdk_liquid import PaymentState
 import logging
 import threading
 import asyncio
@@ -26,7 +27,8 @@ load_dotenv()
 _payment_handler = None
 _handler_lock = threading.Lock()
 _sync_task = None
-_last_sync_time = 0
+_http_client = None
+_last_sync_time = 0  # time.monotonic() of the last confirmed sync, 0 if never
 _consecutive_sync_failures = 0
 
 # Webhook configuration
@@ -78,6 +80,16 @@ def mark_webhook_sent(invoice_id: str, status: str):
             if not statuses:  # Remove payment entry if no statuses left
                 del _webhook_sent_cache[payment_id]
 
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client used for outgoing webhooks.
+    Reusing one client keeps connections to the webhook host alive between notifications.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
 async def send_webhook_notification(invoice_id: str, status: str, payment_details: dict):
     """
     Send webhook notification to WooCommerce about payment status changes.
@@ -99,7 +111,7 @@ async def send_webhook_notification(invoice_id: str, status: str, payment_detail
 
     # Check if webhook was already sent for this payment and status
     if has_webhook_been_sent(invoice_id, status):
-        logger.debug(f"Webhook already sent for {invoice_id[:30]}... status {status}, skipping")
+        logger.debug("Webhook already sent for %.30s... status %s, skipping", invoice_id, status)
         return
 
     try:
@@ -137,28 +149,27 @@ async def send_webhook_notification(invoice_id: str, status: str, payment_detail
         }
 
         logger.info(f"Sending webhook notification for invoice {invoice_id[:30]}...: {status}")
-        logger.debug(f"Webhook payload: {payload_string}")
-        logger.debug(f"Signature components - Timestamp: {timestamp}, Nonce: {nonce}")
-        logger.debug(f"Signature payload: {signature_payload}")
-        logger.debug(f"Generated signature: {signature}")
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook_url,
-                content=payload_string,  # Send raw JSON string to match signature
-                headers=headers,
-                timeout=10.0
-            )
+        logger.debug("Webhook payload: %s", payload_string)
+        logger.debug("Signature components - Timestamp: %s, Nonce: %s", timestamp, nonce)
+        logger.debug("Signature payload: %s", signature_payload)
+        logger.debug("Generated signature: %s", signature)
+
+        response = await get_http_client().post(
+            webhook_url,
+            content=payload_string,  # Send raw JSON string to match signature
+            headers=headers
+        )
+        
+        if response.status_code == 200:
+            logger.info(f"Webhook notification sent successfully for invoice {invoice_id[:30]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Webhook response: %s", response.text)
             
-            if response.status_code == 200:
-                logger.info(f"Webhook notification sent successfully for invoice {invoice_id[:30]}...")
-                logger.debug(f"Webhook response: {response.text}")
-                
-                # Mark webhook as sent only on successful delivery
-                mark_webhook_sent(invoice_id, status)
-            else:
-                logger.error(f"Webhook notification failed for invoice {invoice_id[:30]}...: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+            # Mark webhook as sent only on successful delivery
+            mark_webhook_sent(invoice_id, status)
+        else:
+            logger.error(f"Webhook notification failed for invoice {invoice_id[:30]}...: {response.status_code}")
+            logger.error(f"Response: {response.text}")
 
     except Exception as e:
         logger.error(f"Error sending webhook notification: {str(e)}")
@@ -170,7 +181,7 @@ async def periodic_sync_check():
     
     while True:
         try:
-            current_time = time.time()
+            current_time = time.monotonic()
             
             if not _payment_handler:
                 logger.warning("Payment handler not initialized, waiting...")
@@ -188,14 +199,19 @@ async def periodic_sync_check():
                 
                 # Attempt resync with progressively longer timeouts based on consecutive failures
                 timeout = min(5 + (_consecutive_sync_failures * 2), 30)  # Increase timeout up to 30 seconds
-                if _payment_handler.wait_for_sync(timeout_seconds=timeout):
+                if await asyncio.to_thread(_payment_handler.wait_for_sync, timeout_seconds=timeout):
                     logger.info("SDK resync successful")
-                    _last_sync_time = time.time()
+                    _last_sync_time = time.monotonic()
                     _consecutive_sync_failures = 0
 
                     # After successful sync, check all pending payments
                     try:
-                        pending_payments = _payment_handler.list_payments({"status": "PENDING"})
+                        # Let the SDK filter by state instead of pulling the whole history
+                        pending_payments = await asyncio.to_thread(
+                            _payment_handler.list_payments,
+                            {"states": [PaymentState.PENDING]},
+                            include_details=False
+                        )
                         logger.info(f"Checking {len(pending_payments)} pending payments for status updates")
                         
                         for payment in pending_payments:
@@ -204,10 +220,10 @@ async def periodic_sync_check():
                                 continue
                                 
                             # Check current status
-                            current_status = _payment_handler.check_payment_status(payment_id)
+                            current_status = await asyncio.to_thread(_payment_handler.check_payment_status, payment_id)
                             status = current_status.get('status')
                             
-                            logger.debug(f"Payment {payment_id[:30]}... status: {status}")
+                            logger.debug("Payment %.30s... status: %s", payment_id, status)
                             
                             # Send webhook for completed or failed payments
                             if status in ['SUCCEEDED', 'FAILED']:
@@ -238,6 +254,9 @@ async def periodic_sync_check():
                 _last_sync_time = current_time
                 _consecutive_sync_failures = 0
             
+            # Expire payment tracking older than a day; cheap when nothing has expired
+            _payment_handler.listener.clear_old_data()
+
             # Adjust sleep time based on sync status
             sleep_time = 10 if not is_synced or _consecutive_sync_failures > 0 else 30
             await asyncio.sleep(sleep_time)
@@ -269,7 +288,7 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     """
     # Startup
-    global _payment_handler, _sync_task
+    global _payment_handler, _sync_task, _http_client
     try:
         _payment_handler = PaymentHandler()
         logger.info("Payment system initialized during startup")
@@ -292,6 +311,9 @@ async def lifespan(app: FastAPI):
             pass
         logger.info("Background sync check task stopped")
 
+    if _http_client:
+        await _http_client.aclose()
+
     if _payment_handler:
         try:
             _payment_handler.disconnect()
@@ -342,8 +364,8 @@ class PaymentResponse(BaseModel):
     timestamp: int
     amount_sat: int = 0  # Default to 0 instead of requiring it
     fees_sat: int = 0    # Default to 0 instead of requiring it
-    payment_type: str = "UNKNOWN"  # Default for NOT_FOUND cases
-    status: str
+    payment_type: str = Field("UNKNOWN", description="SDK payment type name: SEND or RECEIVE")  # Default for NOT_FOUND cases
+    status: str = Field(..., description="SDK PaymentState member name, e.g. PENDING, COMPLETE, FAILED")
     details: Dict[str, Any] = {}  # Default to empty dict instead of requiring it
     destination: Optional[str] = None
     tx_id: Optional[str] = None
@@ -362,7 +384,7 @@ class ReceiveResponse(BaseModel):
     source: Optional[str] = None
 
 class SendResponse(BaseModel):
-    status: str
+    status: str = Field(..., description="SDK PaymentState member name, e.g. PENDING, COMPLETE, FAILED")
     destination: Optional[str] = None
     fees_sat: Optional[int] = None
     payment_hash: Optional[str] = None
@@ -374,7 +396,7 @@ class SendOnchainResponse(BaseModel):
     fees_sat: Optional[int] = None
 
 class PaymentStatusResponse(BaseModel):
-    status: str
+    status: str = Field(..., description="SDK PaymentState member name (e.g. PENDING, FAILED) with COMPLETE reported as SUCCEEDED, a state tracked from SDK events (WAITING_CONFIRMATION, SUCCEEDED), or UNKNOWN")
     payment_details: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     timestamp: Optional[int] = None
@@ -412,7 +434,8 @@ class ExchangeRateResponse(BaseModel):
 async def get_api_key(api_key: str = Header(None, alias=API_KEY_NAME)):
     if not API_KEY:
         raise HTTPException(status_code=500, detail="API key not configured on server")
-    if api_key != API_KEY:
+    # Constant-time comparison so response timing does not leak the key
+    if not api_key or not hmac.compare_digest(api_key.encode('utf-8'), API_KEY.encode('utf-8')):
         raise HTTPException(
             status_code=401,
             detail="Invalid API Key",
@@ -437,7 +460,7 @@ async def list_payments(
             "offset": offset,
             "limit": limit
         }
-        payments = handler.list_payments(params)
+        payments = await asyncio.to_thread(handler.list_payments, params)
         return {"payments": payments}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -450,7 +473,8 @@ async def receive_payment(
 ):
     try:
         # Call SDK method with original parameters
-        result = handler.receive_payment(
+        result = await asyncio.to_thread(
+            handler.receive_payment,
             amount=request.amount,
             payment_method=request.method.value,
             description=request.description,
@@ -479,7 +503,8 @@ async def send_payment(
     handler: PaymentHandler = Depends(get_payment_handler)
 ):
     try:
-        result = handler.send_payment(
+        result = await asyncio.to_thread(
+            handler.send_payment,
             destination=request.destination,
             amount_sat=request.amount_sat,
             amount_asset=request.amount_asset,
@@ -498,13 +523,15 @@ async def send_onchain(
 ):
     try:
         # Prepare onchain payment
-        prepare = handler.prepare_pay_onchain(
+        prepare = await asyncio.to_thread(
+            handler.prepare_pay_onchain,
             amount_sat=request.amount_sat,
             drain=request.drain,
             fee_rate_sat_per_vbyte=request.fee_rate_sat_per_vbyte
         )
         # Execute onchain payment
-        handler.pay_onchain(
+        await asyncio.to_thread(
+            handler.pay_onchain,
             address=request.address,
             prepare_response=prepare
         )
@@ -518,7 +545,7 @@ async def onchain_limits(
     handler: PaymentHandler = Depends(get_payment_handler)
 ):
     try:
-        return handler.fetch_onchain_limits()
+        return await asyncio.to_thread(handler.fetch_onchain_limits)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -566,6 +593,7 @@ async def webhook_status(
 @app.get("/check_payment_status/{destination}", response_model=PaymentStatusResponse)
 async def check_payment_status(
     destination: str,
+    background_tasks: BackgroundTasks,
     api_key: str = Depends(get_api_key),
     handler: PaymentHandler = Depends(get_payment_handler)
 ):
@@ -588,14 +616,16 @@ async def check_payment_status(
     """
     logger.info(f"Received payment status check request for identifier: {destination[:30]}...")
     try:
-        result = handler.check_payment_status(destination)
+        result = await asyncio.to_thread(handler.check_payment_status, destination)
         logger.info(f"Payment status check successful. Status: {result.get('status', 'unknown')}")
-        logger.debug(f"Full result: {result}")
+        logger.debug("Full result: %s", result)
 
-        # Send webhook notification for important status changes
+        # Send webhook notification for important status changes after the response
+        # has gone out, so a slow shop does not hold up the status check
         status = result.get('status')
         if status in ['SUCCEEDED', 'FAILED']:
-            await send_webhook_notification(
+            background_tasks.add_task(
+                send_webhook_notification,
                 invoice_id=destination,
                 status=status,
                 payment_details=result
@@ -617,7 +647,7 @@ async def parse_input(
     handler: PaymentHandler = Depends(get_payment_handler)
 ):
     try:
-        return handler.parse_input(request.input)
+        return await asyncio.to_thread(handler.parse_input, request.input)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -630,7 +660,8 @@ async def prepare(
     try:
         from breez_sdk_liquid import LnUrlPayRequestData
         data_obj = LnUrlPayRequestData(**request.data)
-        return handler.prepare_lnurl_pay(
+        return await asyncio.to_thread(
+            handler.prepare_lnurl_pay,
             data=data_obj,
             amount_sat=request.amount_sat,
             comment=request.comment,
@@ -648,7 +679,7 @@ async def pay(
     try:
         from breez_sdk_liquid import PrepareLnUrlPayResponse
         prepare_obj = PrepareLnUrlPayResponse(**request.prepare_response)
-        return handler.lnurl_pay(prepare_obj)
+        return await asyncio.to_thread(handler.lnurl_pay, prepare_obj)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -661,7 +692,7 @@ async def auth(
     try:
         from breez_sdk_liquid import LnUrlAuthRequestData
         data_obj = LnUrlAuthRequestData(**request.data)
-        return {"success": handler.lnurl_auth(data_obj)}
+        return {"success": await asyncio.to_thread(handler.lnurl_auth, data_obj)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -674,11 +705,14 @@ async def withdraw(
     try:
         from breez_sdk_liquid import LnUrlWithdrawRequestData
         data_obj = LnUrlWithdrawRequestData(**request.data)
-        return handler.lnurl_withdraw(
+        return await asyncio.to_thread(
+            handler.lnurl_withdraw,
             data=data_obj,
             amount_msat=request.amount_msat,
             comment=request.comment
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -698,7 +732,7 @@ async def get_exchange_rate(
     """
     logger.info(f"Received exchange rate request for currency: {currency}")
     try:
-        result = handler.get_exchange_rate(currency)
+        result = await asyncio.to_thread(handler.get_exchange_rate, currency)
         
         # Format response based on whether a specific currency was requested
         if currency:
@@ -730,7 +764,7 @@ async def get_all_exchange_rates(
     """
     logger.info("Received request for all exchange rates")
     try:
-        result = handler.get_exchange_rate()
+        result = await asyncio.to_thread(handler.get_exchange_rate)
         return ExchangeRateResponse(rates=result)
     except Exception as e:
         logger.error(f"Error fetching exchange rates: {str(e)}")
@@ -753,11 +787,11 @@ async def get_payment_info(
     Raises:
         HTTPException: 400 if invalid invoice, 500 for unexpected errors
     """
-    logger.debug(f"Received payment info request for invoice: {payment_id[:30]}...")
+    logger.debug("Received payment info request for invoice: %.30s...", payment_id)
     try:
         # Parse the input to verify it's a valid BOLT11 invoice
         try:
-            parsed = handler.parse_input(payment_id)
+            parsed = await asyncio.to_thread(handler.parse_input, payment_id)
             if not parsed.get('type') == 'BOLT11':
                 logger.warning(f"Invalid payment ID format: {payment_id[:30]}...")
                 raise HTTPException(
@@ -771,18 +805,24 @@ async def get_payment_info(
                 detail=f"Invalid BOLT11 invoice: {str(e)}"
             )
 
-        # List all payments and find the matching one
-        payments = handler.list_payments({})
-        for payment in payments:
-            # Check both the destination and payment hash
-            if (payment.get('destination') == payment_id or 
-                payment.get('payment_hash') == parsed.get('invoice', {}).get('payment_hash')):
-                logger.debug(f"Found payment with status: {payment.get('status', 'unknown')}")
+        # Look the payment up directly by the invoice's payment hash instead of
+        # scanning the full payment history. The old destination match is not kept:
+        # a payment whose destination is this invoice carries the invoice's payment
+        # hash, so the hash lookup already finds it.
+        payment_hash = parsed.get('invoice', {}).get('payment_hash')
+        if payment_hash:
+            try:
+                payment = await asyncio.to_thread(handler.get_payment, payment_hash, identifier_type='payment_hash')
+            except Exception as e:
+                # The SDK raises for unknown hashes; treat that as not found
+                logger.debug("Payment lookup by hash failed: %s", e)
+                payment = None
+            if payment:
+                logger.debug("Found payment with status: %s", payment.get('status', 'unknown'))
                 return payment
 
         # If we get here, payment was not found - return a payment object with NOT_FOUND status
-        logger.debug(f"No payment found for invoice: {payment_id[:30]}...")
-        payment_hash = parsed.get('invoice', {}).get('payment_hash')
+        logger.debug("No payment found for invoice: %.30s...", payment_id)
         return {
             'status': 'NOT_FOUND',
             'payment_type': 'UNKNOWN',
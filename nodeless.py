@@ -1,6 +1,12 @@
 import json
 import os
 import argparse
+import collections
+import concurrent.futures
+import enum
+import functools
+import operator
+import re
 from typing import Optional, List, Dict, Any
 from dotenv import load_dotenv
 from breez_sdk_liquid import (
@@ -25,6 +31,8 @@ from breez_sdk_liquid import (
     BuyBitcoinRequest, 
     PreparePayOnchainRequest,
     PayOnchainRequest, 
+    PrepareLnUrlPayRequest,
+    LnUrlPayRequest,
     RefundRequest, 
     RefundableSwap, 
     FetchPaymentProposedFeesRequest, 
@@ -45,13 +53,180 @@ from breez_sdk_liquid import (
 )
 import time
 import logging
-from pprint import pprint
 import threading
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Environment is read once at import; PaymentHandler is a singleton so it is only needed once
+load_dotenv()
+BREEZ_API_KEY = os.getenv('BREEZ_API_KEY')
+BREEZ_SEED_PHRASE = os.getenv('BREEZ_SEED_PHRASE')
+_DEFAULT_WORKING_DIR = os.path.expanduser('~/.breez-cli')
+
+# Payment fields copied as-is into API dictionaries, fetched in one C-level call per payment
+_PAYMENT_FIELDS = ('timestamp', 'amount_sat', 'fees_sat', 'payment_type', 'status', 'destination', 'tx_id')
+_get_payment_fields = operator.attrgetter(*_PAYMENT_FIELDS)
+# Fields of the SDK Limits record returned for onchain/lightning/buy limits
+_LIMIT_FIELDS = ('min_sat', 'max_sat', 'max_zero_conf_sat')
+_get_limit_fields = operator.attrgetter(*_LIMIT_FIELDS)
+# Fields exposed by get_info(); asset_balances is also read by fetch_asset_balance()
+_WALLET_INFO_FIELDS = ('balance_sat', 'pending_send_sat', 'pending_receive_sat', 'fingerprint', 'pubkey', 'asset_balances')
+_BLOCKCHAIN_INFO_FIELDS = ('liquid_tip', 'bitcoin_tip')
+# check_payment_status lookups, tried in order: (request builder, log label)
+_PAYMENT_LOOKUPS = ((GetPaymentRequest.PAYMENT_HASH, 'Payment hash'), (GetPaymentRequest.SWAP_ID, 'Swap ID'))
+# Webhook URLs must be https:// with no whitespace anywhere
+_HTTPS_URL_RE = re.compile(r'\Ahttps://\S+\Z')
+# Listener statuses that end wait_for_payment, and the union used to wake waiters
+_WAIT_SUCCESS = frozenset({'SUCCEEDED', 'PENDING'})
+_WAIT_TERMINAL_FAIL = frozenset({'FAILED', 'REFUNDED'})
+_WAIT_STATUSES = _WAIT_SUCCESS | _WAIT_TERMINAL_FAIL
+# SDK PaymentState names reported under the listener's event-derived name by
+# check_payment_status, so the SDK's settled state matches the SUCCEEDED event state
+_SDK_STATUS_ALIASES = {'COMPLETE': 'SUCCEEDED'}
+# Parsed InputType variant -> converter to the parse_input() result dictionary.
+# Data is read from the parsed *instance* (e.g. parsed.data), not the variant type.
+_PARSE_DISPATCH = {
+    InputType.BITCOIN_ADDRESS: lambda p: {'type': 'BITCOIN_ADDRESS', 'address': p.address.address},
+    InputType.BOLT11: lambda p: {'type': 'BOLT11', 'invoice': p.invoice.__dict__},
+    InputType.LN_URL_PAY: lambda p: {'type': 'LN_URL_PAY', 'data': p.data.__dict__},
+    InputType.LN_URL_AUTH: lambda p: {'type': 'LN_URL_AUTH', 'data': p.data.__dict__},
+    InputType.LN_URL_WITHDRAW: lambda p: {'type': 'LN_URL_WITHDRAW', 'data': p.data.__dict__},
+    InputType.LIQUID_ADDRESS: lambda p: {'type': 'LIQUID_ADDRESS', 'address': p.address.address},
+    InputType.BIP21: lambda p: {'type': 'BIP21', 'data': p.bip21.__dict__},
+    InputType.NODE_ID: lambda p: {'type': 'NODE_ID', 'node_id': p.node_id},
+}
+# UniFFI records are mutable, so requests are still built per call from these constants
+_PAY_AMOUNT_DRAIN = PayAmount.DRAIN
+_WAITING_FEE_STATES = (PaymentState.WAITING_FEE_ACCEPTANCE,)
+# Accepted receive method names, e.g. 'LIGHTNING' -> PaymentMethod.LIGHTNING
+_PAYMENT_METHOD_MAP = {method.name: method for method in PaymentMethod}
+# Accepted buy bitcoin provider names, e.g. 'MOONPAY' -> BuyBitcoinProvider.MOONPAY
+_BUY_PROVIDER_MAP = {provider.name: provider for provider in BuyBitcoinProvider}
+
+
+def _copy_rows(rows) -> List[Dict[str, Any]]:
+    """Returns a new list of shallow-copied row dicts."""
+    return [dict(row) for row in rows]
+
+
+def _ttl_cache(ttl: float, copy=None):
+    """
+    Caches a method's successful result for ttl seconds. Failed calls are not cached,
+    so the next call retries. Intended for zero-argument PaymentHandler methods.
+
+    If copy is given, every caller gets copy(value) instead of the cached object,
+    so mutating a result cannot change what later callers see.
+    """
+    def decorator(func):
+        cache = {}  # self -> (expiry, value)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(self):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(self)
+            if entry is not None and entry[0] > now:
+                value = entry[1]
+            else:
+                value = func(self)
+                with lock:
+                    cache[self] = (time.monotonic() + ttl, value)
+            return copy(value) if copy is not None else value
+
+        return wrapper
+    return decorator
+
+
+def _log_sdk_errors(action: str):
+    """
+    Logs "Error <action>: <exception>" and the method's error exit, then re-raises.
+    Used by PaymentHandler methods whose error message needs no call arguments.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error {action}: {e}")
+                logger.debug("Exiting %s (error)", func.__name__)
+                raise
+
+        return wrapper
+    return decorator
+
+
+def _require_sdk_type(value, sdk_type, method: str):
+    """
+    Raises TypeError unless value is an instance of the given SDK type. Called inside
+    the method's try block so its error logging applies as well.
+    """
+    if not isinstance(value, sdk_type):
+        logger.error(f"{method} expects {sdk_type.__name__} object, but received {type(value)}.")
+        raise TypeError(f"{method} expects the SDK {sdk_type.__name__} object")
+
+
+def _require_positive_int(value, name: str) -> int:
+    """
+    Raises ValueError unless value is a positive int. bool is rejected even though
+    it subclasses int.
+    """
+    if type(value) is not int or value <= 0:
+        logger.warning(f"Invalid {name} provided: {value}")
+        raise ValueError(f"{name} must be a positive integer.")
+    return value
+
+
+def _limits_to_dict(limits) -> Optional[Dict[str, int]]:
+    """Converts an SDK Limits record to a dictionary, or None if absent."""
+    if limits is None:
+        return None
+    return dict(zip(_LIMIT_FIELDS, _get_limit_fields(limits)))
+
+
+def _sdk_scalar(obj):
+    return obj
+
+
+def _sdk_list(obj):
+    return [_sdk_to_dict(i) for i in obj]
+
+
+def _sdk_record(obj):
+    return {k: _sdk_to_dict(v) for k, v in obj.__dict__.items()}
+
+
+_sdk_enum_name = operator.attrgetter('name')
+
+
+# Object type -> converter, chosen on the first object of each type seen
+_sdk_converters = {str: _sdk_scalar, int: _sdk_scalar, float: _sdk_scalar, bool: _sdk_scalar,
+                   type(None): _sdk_scalar, list: _sdk_list}
+
+
+def _sdk_to_dict(obj):
+    """
+    Recursively converts SDK objects to plain dicts/lists/scalars. The conversion for
+    each type is resolved once and cached, so repeated shapes skip the type checks.
+    """
+    converter = _sdk_converters.get(type(obj))
+    if converter is None:
+        if isinstance(obj, enum.Enum):
+            converter = _sdk_enum_name  # Same bare member name as the top-level status fields
+        elif isinstance(obj, (str, int, float, bool)):
+            converter = _sdk_scalar
+        elif isinstance(obj, list):
+            converter = _sdk_list
+        elif hasattr(obj, '__dict__'):
+            converter = _sdk_record
+        else:
+            converter = str  # fallback
+        _sdk_converters[type(obj)] = converter
+    return converter(obj)
+
 
 class SdkListener(EventListener):
     """
@@ -67,14 +242,63 @@ class SdkListener(EventListener):
     - FAILED: Swap failed (expired or lockup transaction failed)
     - WAITING_FEE_ACCEPTANCE: Payment requires fee acceptance
     """
+    # Payment event type -> (tracked status, log message suffix)
+    _PAYMENT_EVENTS = {
+        SdkEvent.PAYMENT_PENDING: ('PENDING', "is pending (lockup transaction broadcast)"),
+        SdkEvent.PAYMENT_WAITING_CONFIRMATION: ('WAITING_CONFIRMATION', "is waiting confirmation (claim tx broadcast)"),
+        SdkEvent.PAYMENT_SUCCEEDED: ('SUCCEEDED', "succeeded (claim tx confirmed)"),
+        SdkEvent.PAYMENT_FAILED: ('FAILED', "failed"),
+        SdkEvent.PAYMENT_WAITING_FEE_ACCEPTANCE: ('WAITING_FEE_ACCEPTANCE', "is waiting for fee acceptance"),
+    }
+    # Details attributes tried in order to identify a payment
+    _ID_ATTRS = ('payment_hash', 'destination', 'swap_id')
+    # Maximum number of payment details kept; the least recently updated are evicted first
+    _DETAILS_CAP = 4096
+
     def __init__(self):
         self.synced = False
-        self.paid = []  # Legacy list for backward compatibility
-        self.refunded = []  # Track refunded payments
+        self.paid = set()  # Legacy paid tracking for backward compatibility
+        self.refunded = set()  # Track refunded payments
         self.payment_statuses = {}  # Track all payment statuses
         self.payment_errors = {}  # Track error messages for failed payments
         self.payment_timestamps = {}  # Track when payments change state
-        self.payment_details = {}  # Cache payment details
+        self.payment_details = collections.OrderedDict()  # Cache payment details, least recently updated first
+        self._order = collections.deque()  # (timestamp, identifier) in update order, oldest first
+        self._synced_event = threading.Event()  # Set once the SDK reports SYNCED
+        self._waiters = {}  # identifier -> list of threading.Event, one per waiter
+        self._waiters_lock = threading.Lock()
+        # Set when a payment may be waiting for fee acceptance; starts set so the
+        # first check also covers payments that entered that state before startup
+        self._waiting_fee_event = threading.Event()
+        self._waiting_fee_event.set()
+        self.event_count = 0  # Bumped on every SDK event; lets callers detect wallet changes
+
+    def _record_state(self, identifier: str, status: str):
+        """Stores a changed status with its timestamp, updates the paid set and raises signals."""
+        # Update status and timestamp
+        timestamp = int(time.time())
+        self.payment_statuses[identifier] = status
+        self.payment_timestamps[identifier] = timestamp
+        self._order.append((timestamp, identifier))
+
+        # Update paid set for backward compatibility
+        if status in ['WAITING_CONFIRMATION', 'SUCCEEDED']:
+            if identifier not in self.paid:
+                self.paid.add(identifier)
+                logger.info(f"Payment {identifier} added to paid set (status: {status})")
+
+        self._signal_status(identifier, status)
+
+    def _signal_status(self, identifier: str, status: str):
+        """Sets the fee-acceptance flag and wakes waiters for a payment that reached status."""
+        if status == 'WAITING_FEE_ACCEPTANCE':
+            self._waiting_fee_event.set()
+
+        # Wake up anyone waiting on this payment
+        if status in _WAIT_STATUSES and identifier in self._waiters:
+            with self._waiters_lock:
+                for event in self._waiters.get(identifier, ()):
+                    event.set()
 
     def _update_payment_state(self, identifier: str, status: str, details: Any = None, error: str = None):
         """Helper method to update payment state and related tracking."""
@@ -82,13 +306,19 @@ class SdkListener(EventListener):
             logger.warning(f"Attempted to update payment state with empty identifier. Status: {status}")
             return
 
-        # Update status and timestamp
-        self.payment_statuses[identifier] = status
-        self.payment_timestamps[identifier] = int(time.time())
+        # Repeated event for a state we already recorded: only refresh the cached details.
+        # Signals are still raised, so a payment that is again waiting for fee acceptance
+        # re-arms the fee check.
+        if self.payment_statuses.get(identifier) == status and error == self.payment_errors.get(identifier):
+            if details:
+                self._cache_details(identifier, details)
+            self._signal_status(identifier, status)
+            logger.debug("Payment %s already in state %s, skipping update", identifier, status)
+            return
 
         # Cache payment details if provided
         if details:
-            self.payment_details[identifier] = details
+            self._cache_details(identifier, details)
 
         # Track errors for failed payments
         if error:
@@ -96,25 +326,42 @@ class SdkListener(EventListener):
         elif status != 'FAILED' and identifier in self.payment_errors:
             del self.payment_errors[identifier]
 
-        # Update paid list for backward compatibility
-        if status in ['WAITING_CONFIRMATION', 'SUCCEEDED']:
-            if identifier not in self.paid:
-                self.paid.append(identifier)
-                logger.info(f"Payment {identifier} added to paid list (status: {status})")
-        
+        self._record_state(identifier, status)
+
         # Log state change
         logger.info(f"Payment {identifier} state updated to {status}" + 
                    (f" with error: {error}" if error else ""))
 
+    def record_status(self, identifier: str, status: str):
+        """
+        Records a status read directly from the SDK (e.g. by check_payment_status).
+
+        Repeated polls reporting the same status only raise the signals again; a changed
+        status goes through the same bookkeeping as an SDK event.
+        """
+        if self.payment_statuses.get(identifier) == status:
+            self._signal_status(identifier, status)
+            return
+        self._record_state(identifier, status)
+
     def on_event(self, event):
         """Handles incoming SDK events."""
-        logger.debug(f"Received SDK event: {event}")
+        self.event_count += 1
+        logger.debug("Received SDK event: %s", event)
 
-        if isinstance(event, SdkEvent.SYNCED):
+        event_type = type(event)
+        if event_type is SdkEvent.SYNCED:
             self.synced = True
+            self._synced_event.set()
             logger.info("SDK synced")
             return
 
+        # Only payment events are tracked; anything else is ignored
+        entry = self._PAYMENT_EVENTS.get(event_type)
+        if entry is None:
+            return
+        status, description = entry
+
         # Extract payment details and identifier
         details = getattr(event, 'details', None)
         if not details:
@@ -123,38 +370,23 @@ class SdkListener(EventListener):
 
         # Determine payment identifier (try multiple possible fields)
         identifier = None
-        if hasattr(details, 'payment_hash') and details.payment_hash:
-            identifier = details.payment_hash
-        elif hasattr(details, 'destination') and details.destination:
-            identifier = details.destination
-        elif hasattr(details, 'swap_id') and details.swap_id:
-            identifier = details.swap_id
+        for attr in self._ID_ATTRS:
+            value = getattr(details, attr, None)
+            if value:
+                identifier = value
+                break
 
         if not identifier:
             logger.warning("Could not determine payment identifier from event")
             return
 
-        # Handle different payment events
-        if isinstance(event, SdkEvent.PAYMENT_PENDING):
-            self._update_payment_state(identifier, 'PENDING', details)
-            logger.info(f"Payment {identifier} is pending (lockup transaction broadcast)")
-
-        elif isinstance(event, SdkEvent.PAYMENT_WAITING_CONFIRMATION):
-            self._update_payment_state(identifier, 'WAITING_CONFIRMATION', details)
-            logger.info(f"Payment {identifier} is waiting confirmation (claim tx broadcast)")
-
-        elif isinstance(event, SdkEvent.PAYMENT_SUCCEEDED):
-            self._update_payment_state(identifier, 'SUCCEEDED', details)
-            logger.info(f"Payment {identifier} succeeded (claim tx confirmed)")
-
-        elif isinstance(event, SdkEvent.PAYMENT_FAILED):
+        if status == 'FAILED':
             error = getattr(details, 'error', 'Unknown error')
-            self._update_payment_state(identifier, 'FAILED', details, error)
-            logger.error(f"Payment {identifier} failed. Error: {error}")
-
-        elif isinstance(event, SdkEvent.PAYMENT_WAITING_FEE_ACCEPTANCE):
-            self._update_payment_state(identifier, 'WAITING_FEE_ACCEPTANCE', details)
-            logger.info(f"Payment {identifier} is waiting for fee acceptance")
+            self._update_payment_state(identifier, status, details, error)
+            logger.error(f"Payment {identifier} {description}. Error: {error}")
+        else:
+            self._update_payment_state(identifier, status, details)
+            logger.info(f"Payment {identifier} {description}")
 
     def is_paid(self, destination: str) -> bool:
         """
@@ -169,6 +401,52 @@ class SdkListener(EventListener):
         """Checks if the SDK is synced."""
         return self.synced
 
+    def wait_synced(self, timeout: float) -> bool:
+        """Blocks until the SDK reports SYNCED or the timeout expires."""
+        return self._synced_event.wait(timeout)
+
+    def reset_synced(self):
+        """Forgets the sync state so the next wait_synced() waits for a fresh SYNCED event."""
+        self.synced = False
+        self._synced_event.clear()
+
+    def take_waiting_fee_flag(self) -> bool:
+        """
+        Returns True if a payment may have entered WAITING_FEE_ACCEPTANCE since the
+        last call, clearing the flag so a later event re-arms it.
+        """
+        if not self._waiting_fee_event.is_set():
+            return False
+        self._waiting_fee_event.clear()
+        return True
+
+    def mark_waiting_fee(self):
+        """Re-arms the waiting-fee flag, e.g. after a failed check that must be retried."""
+        self._waiting_fee_event.set()
+
+    def register_waiter(self, identifier: str) -> threading.Event:
+        """
+        Returns a new event, owned by the caller, that is set when this payment reaches
+        a status a waiter acts on. Every call must be paired with release_waiter().
+        """
+        event = threading.Event()
+        with self._waiters_lock:
+            self._waiters.setdefault(identifier, []).append(event)
+        return event
+
+    def release_waiter(self, identifier: str, event: threading.Event):
+        """Drops a waiter's event, removing the identifier once nobody waits on it."""
+        with self._waiters_lock:
+            events = self._waiters.get(identifier)
+            if events is None:
+                return
+            try:
+                events.remove(event)
+            except ValueError:
+                pass
+            if not events:
+                del self._waiters[identifier]
+
     def get_payment_status(self, identifier: str) -> Optional[str]:
         """
         Get the known status for a payment identified by destination, hash, or swap ID.
@@ -184,6 +462,13 @@ class SdkListener(EventListener):
         """Get the timestamp of the last state change for a payment."""
         return self.payment_timestamps.get(identifier)
 
+    def _cache_details(self, identifier: str, details: Any):
+        """Stores the latest details for a payment, evicting the oldest beyond _DETAILS_CAP."""
+        self.payment_details[identifier] = details
+        self.payment_details.move_to_end(identifier)
+        while len(self.payment_details) > self._DETAILS_CAP:
+            self.payment_details.popitem(last=False)
+
     def get_payment_details(self, identifier: str) -> Optional[Any]:
         """Get cached payment details if available."""
         return self.payment_details.get(identifier)
@@ -194,23 +479,29 @@ class SdkListener(EventListener):
         This helps prevent memory growth from old payment data.
         """
         current_time = int(time.time())
-        old_identifiers = [
-            identifier for identifier, timestamp in self.payment_timestamps.items()
-            if current_time - timestamp > max_age_seconds
-        ]
+        expired = set()
 
-        for identifier in old_identifiers:
+        # _order is oldest first, so only the expired prefix is visited. Entries whose
+        # payment was updated again later are stale and are dropped without clearing.
+        while self._order and current_time - self._order[0][0] > max_age_seconds:
+            timestamp, identifier = self._order.popleft()
+            if self.payment_timestamps.get(identifier) == timestamp:
+                expired.add(identifier)
+
+        if not expired:
+            return
+
+        # Deleted in place: SDK events update these dicts from the SDK's callback thread,
+        # and rebinding them to rebuilt copies could drop an update made meanwhile
+        for identifier in expired:
             self.payment_statuses.pop(identifier, None)
             self.payment_errors.pop(identifier, None)
             self.payment_timestamps.pop(identifier, None)
             self.payment_details.pop(identifier, None)
-            if identifier in self.paid:
-                self.paid.remove(identifier)
-            if identifier in self.refunded:
-                self.refunded.remove(identifier)
+            self.paid.discard(identifier)
+            self.refunded.discard(identifier)
 
-        if old_identifiers:
-            logger.info(f"Cleared {len(old_identifiers)} old payment records")
+        logger.info(f"Cleared {len(expired)} old payment records")
 
 
 class PaymentHandler:
@@ -221,6 +512,11 @@ class PaymentHandler:
     _instance = None
     _initialized = False
     _lock = threading.Lock()
+    # (listener event_count, monotonic expiry, balances) from the last fetch_asset_balance
+    _asset_balances_cache = None
+    _ASSET_BALANCES_TTL = 5
+    # Wallet pubkey, fixed for the lifetime of the wallet; filled on first sign_message
+    _cached_pubkey = None
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -229,25 +525,28 @@ class PaymentHandler:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, network: LiquidNetwork = LiquidNetwork.MAINNET, working_dir: str = '~/.breez-cli', 
+    def __init__(self, network: LiquidNetwork = LiquidNetwork.MAINNET, working_dir: str = _DEFAULT_WORKING_DIR, 
                  asset_metadata: Optional[List[AssetMetadata]] = None, 
                  external_input_parsers: Optional[List[ExternalInputParser]] = None):
         """
         Initializes the PaymentHandler and connects to the Breez SDK.
         Uses singleton pattern to prevent multiple initializations.
         """
+        # Unlocked fast path: _initialized is only set at the end of the locked block
+        # below, and the GIL makes the flag read atomic, so later calls never take the lock.
         if self._initialized:
             return
 
+        working_dir = os.path.expanduser(working_dir)
+
         with self._lock:
             if self._initialized:
                 return
 
             logger.debug("Initializing PaymentHandler")
-            load_dotenv()
 
-            self.breez_api_key = os.getenv('BREEZ_API_KEY')
-            self.seed_phrase = os.getenv('BREEZ_SEED_PHRASE')
+            self.breez_api_key = BREEZ_API_KEY
+            self.seed_phrase = BREEZ_SEED_PHRASE
 
             if not self.breez_api_key:
                 logger.error("BREEZ_API_KEY not found in environment variables.")
@@ -259,7 +558,7 @@ class PaymentHandler:
             logger.info("Retrieved credentials from environment successfully")
 
             config = default_config(network, self.breez_api_key)
-            config.working_dir = os.path.expanduser(working_dir)
+            config.working_dir = working_dir
             
             try:
                 os.makedirs(config.working_dir, exist_ok=True)
@@ -292,13 +591,10 @@ class PaymentHandler:
 
     def wait_for_sync(self, timeout_seconds: int = 10) -> bool:
         """Wait for the SDK to sync before proceeding."""
-        logger.debug(f"Waiting for sync (timeout={timeout_seconds}s)")
-        start_time = time.time()
-        while time.time() - start_time < timeout_seconds:
-            if self.listener.is_synced():
-                logger.debug("SDK synced successfully")
-                return True
-            time.sleep(0.1)  # Shorter sleep interval
+        logger.debug("Waiting for sync (timeout=%ss)", timeout_seconds)
+        if self.listener.wait_synced(timeout_seconds):
+            logger.debug("SDK synced successfully")
+            return True
         logger.warning("SDK sync timeout")
         return False
 
@@ -307,25 +603,34 @@ class PaymentHandler:
         Wait for payment to complete or timeout for a specific identifier
         (destination, hash, or swap ID).
         """
-        logger.debug(f"Entering wait_for_payment (identifier={identifier}, timeout={timeout_seconds}s)")
-        start_time = time.time()
-        while time.time() - start_time < timeout_seconds:
-            status = self.listener.get_payment_status(identifier)
-            if status in ['SUCCEEDED', 'PENDING']:
-                logger.debug(f"Payment for {identifier} has status: {status}")
-                logger.debug("Exiting wait_for_payment (succeeded or pending)")
-                return True
-            if status == 'FAILED':
-                 logger.error(f"Payment for {identifier} failed during wait.")
-                 logger.debug("Exiting wait_for_payment (failed)")
-                 return False
-            # Consider other final states like 'REFUNDED' if applicable
-            if status == 'REFUNDED':
-                logger.info(f"Swap for {identifier} was refunded during wait.")
-                logger.debug("Exiting wait_for_payment (refunded)")
-                return False
-
-            time.sleep(1)
+        logger.debug("Entering wait_for_payment (identifier=%s, timeout=%ss)", identifier, timeout_seconds)
+        payment_event = self.listener.register_waiter(identifier)
+        try:
+            # Monotonic clock so wall-clock adjustments cannot stretch or cut the timeout
+            deadline = time.monotonic() + timeout_seconds
+            while True:
+                # Clear before reading the status so a state change in between is not lost.
+                # The event belongs to this waiter only, so other waiters cannot clear it.
+                payment_event.clear()
+                status = self.listener.get_payment_status(identifier)
+                if status in _WAIT_SUCCESS:
+                    logger.debug("Payment for %s has status: %s", identifier, status)
+                    logger.debug("Exiting wait_for_payment (succeeded or pending)")
+                    return True
+                if status in _WAIT_TERMINAL_FAIL:
+                    if status == 'FAILED':
+                        logger.error(f"Payment for {identifier} failed during wait.")
+                        logger.debug("Exiting wait_for_payment (failed)")
+                    else:
+                        logger.info(f"Swap for {identifier} was refunded during wait.")
+                        logger.debug("Exiting wait_for_payment (refunded)")
+                    return False
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not payment_event.wait(remaining):
+                    break
+        finally:
+            self.listener.release_waiter(identifier, payment_event)
         logger.warning(f"Wait for payment for {identifier} timed out.")
         logger.debug("Exiting wait_for_payment (timeout)")
         return False
@@ -337,6 +642,7 @@ class PaymentHandler:
             # Check if the instance attribute exists and is not None
             if hasattr(self, 'instance') and self.instance:
                 self.instance.disconnect()
+                self.listener.reset_synced()
                 logger.info("Breez SDK disconnected.")
             else:
                 logger.warning("Disconnect called but SDK instance was not initialized or already disconnected.")
@@ -349,6 +655,7 @@ class PaymentHandler:
 
 
     # --- Wallet Operations ---
+    @_log_sdk_errors("getting info")
     def get_info(self) -> Dict[str, Any]:
         """
         Fetches general wallet and blockchain information.
@@ -357,36 +664,36 @@ class PaymentHandler:
             Dictionary containing wallet_info and blockchain_info.
         """
         logger.debug("Entering get_info")
-        try:
-            info = self.instance.get_info()
-            # Convert info object to dictionary for easier handling
-            info_dict = {
-                'wallet_info': info.wallet_info.__dict__ if info.wallet_info else None,
-                'blockchain_info': info.blockchain_info.__dict__ if info.blockchain_info else None,
-            }
-            logger.debug(f"Fetched wallet info successfully.")
-            logger.debug("Exiting get_info")
-            return info_dict
-        except Exception as e:
-            logger.error(f"Error getting info: {e}")
-            logger.debug("Exiting get_info (error)")
-            raise
-
-    def list_payments(self, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        info = self.instance.get_info()
+        wallet_info = info.wallet_info
+        blockchain_info = info.blockchain_info
+        # Convert info object to dictionary for easier handling
+        info_dict = {
+            'wallet_info': {f: getattr(wallet_info, f, None) for f in _WALLET_INFO_FIELDS} if wallet_info else None,
+            'blockchain_info': {f: getattr(blockchain_info, f, None) for f in _BLOCKCHAIN_INFO_FIELDS} if blockchain_info else None,
+        }
+        logger.debug("Fetched wallet info successfully.")
+        logger.debug("Exiting get_info")
+        return info_dict
+
+    def list_payments(self, params: Optional[Dict[str, Any]] = None, *, include_details: bool = True) -> List[Dict[str, Any]]:
         """
         Lists payment history with optional filters.
 
         Args:
             params: Dictionary with optional filters (from_timestamp, to_timestamp,
-                    offset, limit, filters, details). 'filters' should be a list
-                    of breez_sdk_liquid.PaymentType members. 'details' should be
-                    a breez_sdk_liquid.ListPaymentDetails object.
+                    offset, limit, filters, states, details). 'filters' should be a list
+                    of breez_sdk_liquid.PaymentType members. 'states' should be a list
+                    of breez_sdk_liquid.PaymentState members. 'details' should be
+                    a breez_sdk_liquid.ListPaymentDetails object. An 'include_details'
+                    key overrides the keyword argument of the same name.
+            include_details: If False, the 'details' dict of each payment is left as None.
         Returns:
             List of payment dictionaries.
         Raises:
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering list_payments with params: {params}")
+        logger.debug("Entering list_payments with params: %s", params)
         try:
             from_ts = int(params.get('from_timestamp')) if params and params.get('from_timestamp') is not None else None
             to_ts = int(params.get('to_timestamp')) if params and params.get('to_timestamp') is not None else None
@@ -395,7 +702,10 @@ class PaymentHandler:
 
             # --- Handle optional filters and details ---
             filters = params.get('filters') if params else None # Expects List[PaymentType]
+            states = params.get('states') if params else None # Expects List[PaymentState]
             details_param = params.get('details') if params else None # Expects ListPaymentDetails
+            if params and 'include_details' in params:
+                include_details = bool(params['include_details'])
 
             # Add validation for filters/details types if needed
             if filters is not None and not isinstance(filters, list):
@@ -403,6 +713,9 @@ class PaymentHandler:
                  # Decide whether to raise error or proceed without filter
                  # raise ValueError("'filters' parameter must be a list of PaymentType")
                  filters = None # Ignore invalid input
+            if states is not None and not isinstance(states, list):
+                 logger.warning(f"Invalid type for 'states' parameter: {type(states)}")
+                 states = None # Ignore invalid input
 
             # Validation for details_param is trickier as it's a union type
             # We'll trust the caller passes the correct SDK object or None
@@ -413,6 +726,7 @@ class PaymentHandler:
                 offset=offset,
                 limit=limit,
                 filters=filters,
+                states=states,
                 details=details_param,
             )
             # --- End handle optional filters and details ---
@@ -420,25 +734,9 @@ class PaymentHandler:
             payments = self.instance.list_payments(req)
 
             # Convert payment objects to dictionaries for easier handling
-            payment_list = []
-            for payment in payments:
-                 # Use a helper function if this conversion becomes complex/repeated
-                 payment_dict = {
-                    'id': getattr(payment, 'id', None), # Payments might have an ID? Check SDK docs
-                    'timestamp': payment.timestamp,
-                    'amount_sat': payment.amount_sat,
-                    'fees_sat': payment.fees_sat,
-                    'payment_type': str(payment.payment_type), # Convert Enum to string
-                    'status': str(payment.status), # Convert Enum to string
-                    'details': self.sdk_to_dict(payment.details) if payment.details else None, # Include details dict
-                    'destination': getattr(payment, 'destination', None), # Optional field
-                    'tx_id': getattr(payment, 'tx_id', None), # Optional field
-                    'payment_hash': getattr(payment.details, 'payment_hash', None), # Often useful, from details
-                    'swap_id': getattr(payment.details, 'swap_id', None), # Often useful, from details
-                 }
-                 payment_list.append(payment_dict)
-
-            logger.debug(f"Listed {len(payment_list)} payments.")
+            payment_list = [self._payment_to_dict(payment, include_details) for payment in payments]
+
+            logger.debug("Listed %s payments.", len(payment_list))
             logger.debug("Exiting list_payments")
             return payment_list
 
@@ -447,20 +745,21 @@ class PaymentHandler:
             logger.debug("Exiting list_payments (error)")
             raise
 
-    def get_payment(self, identifier: str, identifier_type: str = 'payment_hash') -> Optional[Dict[str, Any]]:
+    def get_payment(self, identifier: str, identifier_type: str = 'payment_hash', *, include_details: bool = True) -> Optional[Dict[str, Any]]:
         """
         Retrieves a specific payment by hash or swap ID.
 
         Args:
             identifier: The payment hash or swap ID string.
             identifier_type: 'payment_hash' or 'swap_id'.
+            include_details: If False, the 'details' dict is left as None.
         Returns:
             Payment dictionary or None if not found.
         Raises:
             ValueError: If invalid identifier_type is provided.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering get_payment with identifier: {identifier}, type: {identifier_type}")
+        logger.debug("Entering get_payment with identifier: %s, type: %s", identifier, identifier_type)
         try:
             req = None
             if identifier_type == 'payment_hash':
@@ -473,25 +772,12 @@ class PaymentHandler:
 
             payment = self.instance.get_payment(req)
             if payment:
-                 # Use a helper function if payment-to-dict conversion is common
-                 payment_dict = {
-                    'id': getattr(payment, 'id', None),
-                    'timestamp': payment.timestamp,
-                    'amount_sat': payment.amount_sat,
-                    'fees_sat': payment.fees_sat,
-                    'payment_type': str(payment.payment_type),
-                    'status': str(payment.status),
-                    'details': self.sdk_to_dict(payment.details) if payment.details else None,
-                    'destination': getattr(payment, 'destination', None),
-                    'tx_id': getattr(payment, 'tx_id', None),
-                    'payment_hash': getattr(payment.details, 'payment_hash', None),
-                    'swap_id': getattr(payment.details, 'swap_id', None),
-                 }
-                 logger.debug(f"Fetched payment: {identifier}")
+                 payment_dict = self._payment_to_dict(payment, include_details)
+                 logger.debug("Fetched payment: %s", identifier)
                  logger.debug("Exiting get_payment (found)")
                  return payment_dict
             else:
-                 logger.debug(f"Payment not found: {identifier}")
+                 logger.debug("Payment not found: %s", identifier)
                  logger.debug("Exiting get_payment (not found)")
                  return None
 
@@ -518,26 +804,26 @@ class PaymentHandler:
             ValueError: If inconsistent or missing amount arguments.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering send_payment to {destination} (amount_sat={amount_sat}, amount_asset={amount_asset}, asset_id={asset_id}, drain={drain})")
+        logger.debug("Entering send_payment to %s (amount_sat=%s, amount_asset=%s, asset_id=%s, drain=%s)", destination, amount_sat, amount_asset, asset_id, drain)
         try:
             amount_obj = None
 
             if drain:
-                amount_obj = PayAmount.DRAIN
+                amount_obj = _PAY_AMOUNT_DRAIN
                 logger.debug("Sending payment using DRAIN amount.")
             elif amount_sat is not None:
                 if amount_asset is not None or asset_id is not None:
                     logger.warning("Conflicting amount arguments: amount_sat provided with asset arguments.")
                     raise ValueError("Provide either amount_sat, or (amount_asset and asset_id), or drain=True.")
                 amount_obj = PayAmount.BITCOIN(amount_sat)
-                logger.debug(f"Sending Bitcoin payment with amount: {amount_sat} sat.")
+                logger.debug("Sending Bitcoin payment with amount: %s sat.", amount_sat)
             elif amount_asset is not None and asset_id is not None:
                  if amount_sat is not None or drain:
                      logger.warning("Conflicting amount arguments: asset arguments provided with amount_sat or drain.")
                      raise ValueError("Provide either amount_sat, or (amount_asset and asset_id), or drain=True.")
                  # False is 'is_liquid_fee' - typically false for standard asset sends
                  amount_obj = PayAmount.ASSET(asset_id, amount_asset, False)
-                 logger.debug(f"Sending asset payment {asset_id} with amount: {amount_asset}.")
+                 logger.debug("Sending asset payment %s with amount: %s.", asset_id, amount_asset)
             else:
                  logger.warning("Missing or inconsistent amount arguments.")
                  raise ValueError("Provide either amount_sat, or (amount_asset and asset_id), or drain=True.")
@@ -548,22 +834,24 @@ class PaymentHandler:
 
             # You might want to add a step here to check fees and potentially ask for confirmation
             logger.info(f"Prepared send payment to {destination}. Fees: {prepare_res.fees_sat} sat.")
-            logger.debug(f"PrepareSendRequest response: {prepare_res.__dict__}")
+            logger.debug("PrepareSendRequest response: %s", prepare_res.__dict__)
 
 
             req = SendPaymentRequest(prepare_response=prepare_res)
             send_res = self.instance.send_payment(req)
 
             # You can track the payment status via the listener or check_payment_status later
+            payment = send_res.payment
+            details = payment.details
             initiated_payment_details = {
-                'status': str(send_res.payment.status), # Initial status (likely PENDING)
-                'destination': getattr(send_res.payment, 'destination', None), # May or may not be present
+                'status': payment.status.name, # Initial status (likely PENDING)
+                'destination': getattr(payment, 'destination', None), # May or may not be present
                 'fees_sat': prepare_res.fees_sat, # Prepared fees, final fees might differ slightly
-                'payment_hash': getattr(send_res.payment.details, 'payment_hash', None), # Likely present for lightning
-                'swap_id': getattr(send_res.payment.details, 'swap_id', None), # Likely present for onchain/liquid swaps
+                'payment_hash': getattr(details, 'payment_hash', None), # Likely present for lightning
+                'swap_id': getattr(details, 'swap_id', None), # Likely present for onchain/liquid swaps
             }
             logger.info(f"Send payment initiated to {destination}.")
-            logger.debug(f"Send payment initiated details: {initiated_payment_details}")
+            logger.debug("Send payment initiated details: %s", initiated_payment_details)
             logger.debug("Exiting send_payment (initiated)")
 
             return initiated_payment_details
@@ -589,33 +877,33 @@ class PaymentHandler:
             ValueError: If invalid payment_method is provided.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering receive_payment (amount={amount}, method={payment_method}, asset={asset_id})")
+        logger.debug("Entering receive_payment (amount=%s, method=%s, asset=%s)", amount, payment_method, asset_id)
         try:
-            method = getattr(PaymentMethod, payment_method.upper(), None)
+            method = _PAYMENT_METHOD_MAP.get(payment_method) or _PAYMENT_METHOD_MAP.get(payment_method.upper())
             if not method:
                  logger.warning(f"Invalid payment_method: {payment_method}")
                  raise ValueError(f"Invalid payment_method: {payment_method}. Must be 'LIGHTNING', 'BITCOIN_ADDRESS', or 'LIQUID_ADDRESS'.")
 
             if asset_id:
                 receive_amount_obj = ReceiveAmount.ASSET(asset_id, amount)
-                logger.debug(f"Receiving asset {asset_id} with amount {amount}")
+                logger.debug("Receiving asset %s with amount %s", asset_id, amount)
             else:
                 receive_amount_obj = ReceiveAmount.BITCOIN(amount)
-                logger.debug(f"Receiving Bitcoin with amount {amount} sat.")
+                logger.debug("Receiving Bitcoin with amount %s sat.", amount)
 
 
             prepare_req = PrepareReceiveRequest(payment_method=method, amount=receive_amount_obj)
             prepare_res = self.instance.prepare_receive_payment(prepare_req)
 
             logger.info(f"Prepared receive payment ({payment_method}). Fees: {prepare_res.fees_sat} sat.")
-            logger.debug(f"PrepareReceiveRequest response: {prepare_res.__dict__}")
+            logger.debug("PrepareReceiveRequest response: %s", prepare_res.__dict__)
 
 
             req = ReceivePaymentRequest(prepare_response=prepare_res, description=description)
             receive_res = self.instance.receive_payment(req)
 
             logger.info(f"Receive payment destination generated: {receive_res.destination}")
-            logger.debug(f"Receive payment response: {receive_res.__dict__}")
+            logger.debug("Receive payment response: %s", receive_res.__dict__)
             logger.debug("Exiting receive_payment")
 
 
@@ -642,10 +930,10 @@ class PaymentHandler:
         try:
             limits = self.instance.fetch_onchain_limits() # Onchain limits apply to Buy/Sell
             limits_dict = {
-                'receive': limits.receive.__dict__ if limits.receive else None,
-                'send': limits.send.__dict__ if limits.send else None,
+                'receive': _limits_to_dict(limits.receive),
+                'send': _limits_to_dict(limits.send),
             }
-            logger.debug(f"Fetched buy/sell limits successfully.")
+            logger.debug("Fetched buy/sell limits successfully.")
             logger.debug("Exiting fetch_buy_bitcoin_limits")
             return limits_dict
         except Exception as e:
@@ -666,18 +954,12 @@ class PaymentHandler:
             ValueError: If invalid provider is provided.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering prepare_buy_bitcoin (provider={provider}, amount={amount_sat})")
+        logger.debug("Entering prepare_buy_bitcoin (provider=%s, amount=%s)", provider, amount_sat)
         try:
-            buy_provider = getattr(BuyBitcoinProvider, provider.upper(), None)
-            if not buy_provider:
-                 logger.warning(f"Invalid buy bitcoin provider: {provider}")
-                 raise ValueError(f"Invalid buy bitcoin provider: {provider}.")
-
-            req = PrepareBuyBitcoinRequest(provider=buy_provider, amount_sat=amount_sat)
-            prepare_res = self.instance.prepare_buy_bitcoin(req)
-            prepare_res_dict = prepare_res.__dict__
+            prepare_res = self._prepare_buy_bitcoin(provider, amount_sat)
+            prepare_res_dict = dict(vars(prepare_res))  # Copy, so callers cannot mutate the SDK object
             logger.info(f"Prepared buy bitcoin with {provider}. Fees: {prepare_res.fees_sat} sat.")
-            logger.debug(f"PrepareBuyBitcoinRequest response: {prepare_res_dict}")
+            logger.debug("PrepareBuyBitcoinRequest response: %s", prepare_res_dict)
             logger.debug("Exiting prepare_buy_bitcoin")
 
             return prepare_res_dict
@@ -686,6 +968,16 @@ class PaymentHandler:
             logger.debug("Exiting prepare_buy_bitcoin (error)")
             raise
 
+    def _prepare_buy_bitcoin(self, provider: str, amount_sat: int) -> PrepareBuyBitcoinResponse:
+        """Validates the provider and returns the SDK PrepareBuyBitcoinResponse object."""
+        buy_provider = _BUY_PROVIDER_MAP.get(provider) or _BUY_PROVIDER_MAP.get(provider.upper())
+        if not buy_provider:
+             logger.warning(f"Invalid buy bitcoin provider: {provider}")
+             raise ValueError(f"Invalid buy bitcoin provider: {provider}.")
+
+        req = PrepareBuyBitcoinRequest(provider=buy_provider, amount_sat=amount_sat)
+        return self.instance.prepare_buy_bitcoin(req)
+
     # Refined signature to expect the SDK object
     def buy_bitcoin(self, prepare_response: PrepareBuyBitcoinResponse) -> str:
         """
@@ -701,14 +993,8 @@ class PaymentHandler:
         """
         logger.debug("Entering buy_bitcoin")
         try:
-            # Check if it's the correct type of SDK object
-            if not isinstance(prepare_response, PrepareBuyBitcoinResponse):
-                 logger.error(f"buy_bitcoin expects PrepareBuyBitcoinResponse object, but received {type(prepare_response)}.")
-                 raise TypeError("buy_bitcoin expects the SDK PrepareBuyBitcoinResponse object")
-
-            req = BuyBitcoinRequest(prepare_response=prepare_response) # Pass the actual object
-            url = self.instance.buy_bitcoin(req)
-            logger.info(f"Buy bitcoin URL generated.")
+            _require_sdk_type(prepare_response, PrepareBuyBitcoinResponse, 'buy_bitcoin')
+            url = self._buy_bitcoin(prepare_response)
             logger.debug("Exiting buy_bitcoin")
             return url
         except Exception as e:
@@ -716,44 +1002,71 @@ class PaymentHandler:
             logger.debug("Exiting buy_bitcoin (error)")
             raise
 
-    # --- Fiat Currencies ---
-    def list_fiat_currencies(self) -> List[Dict[str, Any]]:
+    def _buy_bitcoin(self, prepare_response: PrepareBuyBitcoinResponse) -> str:
+        """Executes a prepared buy Bitcoin request; callers handle error logging."""
+        req = BuyBitcoinRequest(prepare_response=prepare_response) # Pass the actual object
+        url = self.instance.buy_bitcoin(req)
+        logger.info(f"Buy bitcoin URL generated.")
+        return url
+
+    def buy_bitcoin_oneshot(self, provider: str, amount_sat: int) -> str:
         """
-        Lists supported fiat currencies.
+        Prepares and executes a buy Bitcoin request in one call, for callers that do
+        not need to show the fees first. Use prepare_buy_bitcoin/buy_bitcoin otherwise.
 
+        Args:
+            provider: The buy provider string (e.g., 'MOONPAY').
+            amount_sat: The amount in satoshis to buy.
         Returns:
-            List of fiat currency dictionaries.
+            The URL string to complete the purchase.
+        Raises:
+            ValueError: If invalid provider is provided.
+            Exception: For any SDK errors.
         """
-        logger.debug("Entering list_fiat_currencies")
+        logger.debug("Entering buy_bitcoin_oneshot (provider=%s, amount=%s)", provider, amount_sat)
         try:
-            currencies = self.instance.list_fiat_currencies()
-            currencies_list = [c.__dict__ for c in currencies]
-            logger.debug(f"Listed {len(currencies_list)} fiat currencies.")
-            logger.debug("Exiting list_fiat_currencies")
-            return currencies_list
+            prepare_res = self._prepare_buy_bitcoin(provider, amount_sat)
+            logger.info(f"Prepared buy bitcoin with {provider}. Fees: {prepare_res.fees_sat} sat.")
+            url = self._buy_bitcoin(prepare_res)
+            logger.debug("Exiting buy_bitcoin_oneshot")
+            return url
         except Exception as e:
-            logger.error(f"Error listing fiat currencies: {e}")
-            logger.debug("Exiting list_fiat_currencies (error)")
+            logger.error(f"Error buying bitcoin for {amount_sat} with {provider}: {e}")
+            logger.debug("Exiting buy_bitcoin_oneshot (error)")
             raise
 
+    # --- Fiat Currencies ---
+    @_ttl_cache(ttl=86400, copy=_copy_rows)
+    @_log_sdk_errors("listing fiat currencies")
+    def list_fiat_currencies(self) -> List[Dict[str, Any]]:
+        """
+        Lists supported fiat currencies. Results are cached for 24 hours.
+
+        Returns:
+            List of fiat currency dictionaries.
+        """
+        logger.debug("Entering list_fiat_currencies")
+        currencies = self.instance.list_fiat_currencies()
+        currencies_list = [dict(vars(c)) for c in currencies]  # Copies, so callers cannot mutate the SDK objects
+        logger.debug("Listed %s fiat currencies.", len(currencies_list))
+        logger.debug("Exiting list_fiat_currencies")
+        return currencies_list
+
+    @_ttl_cache(ttl=60, copy=_copy_rows)
+    @_log_sdk_errors("fetching fiat rates")
     def fetch_fiat_rates(self) -> List[Dict[str, Any]]:
         """
-        Fetches current fiat exchange rates.
+        Fetches current fiat exchange rates. Results are cached for 60 seconds.
 
         Returns:
             List of fiat rate dictionaries.
         """
         logger.debug("Entering fetch_fiat_rates")
-        try:
-            rates = self.instance.fetch_fiat_rates()
-            rates_list = [r.__dict__ for r in rates]
-            logger.debug(f"Fetched {len(rates_list)} fiat rates.")
-            logger.debug("Exiting fetch_fiat_rates")
-            return rates_list
-        except Exception as e:
-            logger.error(f"Error fetching fiat rates: {e}")
-            logger.debug("Exiting fetch_fiat_rates (error)")
-            raise
+        rates = self.instance.fetch_fiat_rates()
+        rates_list = [dict(vars(r)) for r in rates]  # Copies, so callers cannot mutate the SDK objects
+        logger.debug("Fetched %s fiat rates.", len(rates_list))
+        logger.debug("Exiting fetch_fiat_rates")
+        return rates_list
 
     # --- LNURL Operations ---
     def parse_input(self, input_str: str) -> Dict[str, Any]:
@@ -767,36 +1080,19 @@ class PaymentHandler:
         Raises:
             Exception: For any SDK errors during parsing.
         """
-        logger.debug(f"Entering parse_input with input: {input_str}")
+        logger.debug("Entering parse_input with input: %s", input_str)
         try:
             parsed_input = self.instance.parse(input_str)
             # Convert the specific InputType object to a dictionary
-            # Access .data on the *instance* of the parsed input, not the type
-            if isinstance(parsed_input, InputType.BITCOIN_ADDRESS):
-                 result = {'type': 'BITCOIN_ADDRESS', 'address': parsed_input.address.address}
-            elif isinstance(parsed_input, InputType.BOLT11):
-                 result = {'type': 'BOLT11', 'invoice': parsed_input.invoice.__dict__}
-            elif isinstance(parsed_input, InputType.LN_URL_PAY):
-                 # Access data on the instance: parsed_input.data
-                 result = {'type': 'LN_URL_PAY', 'data': parsed_input.data.__dict__}
-            elif isinstance(parsed_input, InputType.LN_URL_AUTH):
-                 # Access data on the instance: parsed_input.data
-                 result = {'type': 'LN_URL_AUTH', 'data': parsed_input.data.__dict__}
-            elif isinstance(parsed_input, InputType.LN_URL_WITHDRAW):
-                 # Access data on the instance: parsed_input.data
-                 result = {'type': 'LN_URL_WITHDRAW', 'data': parsed_input.data.__dict__}
-            elif isinstance(parsed_input, InputType.LIQUID_ADDRESS):
-                 result = {'type': 'LIQUID_ADDRESS', 'address': parsed_input.address.address}
-            elif isinstance(parsed_input, InputType.BIP21):
-                 result = {'type': 'BIP21', 'data': parsed_input.bip21.__dict__}
-            elif isinstance(parsed_input, InputType.NODE_ID):
-                 result = {'type': 'NODE_ID', 'node_id': parsed_input.node_id}
+            converter = _PARSE_DISPATCH.get(type(parsed_input))
+            if converter is not None:
+                 result = converter(parsed_input)
             else:
                  # Log raw data for unhandled types to aid debugging
                  logger.warning(f"Parsed unknown input type: {type(parsed_input)}")
                  result = {'type': 'UNKNOWN', 'raw_input': input_str, 'raw_parsed_object': str(parsed_input)}
 
-            logger.debug(f"Parsed input successfully. Type: {result.get('type')}")
+            logger.debug("Parsed input successfully. Type: %s", result.get('type'))
             logger.debug("Exiting parse_input")
 
             return result
@@ -821,28 +1117,13 @@ class PaymentHandler:
             TypeError: If data is not the correct object type.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering prepare_lnurl_pay (amount={amount_sat}, comment={comment})")
+        logger.debug("Entering prepare_lnurl_pay (amount=%s, comment=%s)", amount_sat, comment)
         try:
-            # Check if it's the correct type of SDK object
-            if not isinstance(data, LnUrlPayRequestData):
-                 logger.error(f"prepare_lnurl_pay expects LnUrlPayRequestData object, but received {type(data)}.")
-                 raise TypeError("prepare_lnurl_pay expects the SDK LnUrlPayRequestData object")
-
-
-            # Handle amount format for PayAmount
-            pay_amount = PayAmount.BITCOIN(amount_sat)
-
-            req = PrepareLnUrlPayRequest(
-                 data=data, # Use the passed object
-                 amount=pay_amount,
-                 comment=comment,
-                 validate_success_action_url=validate_success_action_url,
-                 bip353_address=getattr(data, 'bip353_address', None) # Get bip353_address from the object
-            )
-            prepare_res = self.instance.prepare_lnurl_pay(req)
-            prepare_res_dict = prepare_res.__dict__
+            _require_sdk_type(data, LnUrlPayRequestData, 'prepare_lnurl_pay')
+            prepare_res = self._prepare_lnurl_pay(data, amount_sat, comment, validate_success_action_url)
+            prepare_res_dict = dict(vars(prepare_res))  # Copy, so callers cannot mutate the SDK object
             logger.info(f"Prepared LNURL-Pay. Fees: {prepare_res.fees_sat} sat.")
-            logger.debug(f"PrepareLnUrlPayRequest response: {prepare_res_dict}")
+            logger.debug("PrepareLnUrlPayRequest response: %s", prepare_res_dict)
             logger.debug("Exiting prepare_lnurl_pay")
 
             return prepare_res_dict
@@ -851,6 +1132,21 @@ class PaymentHandler:
             logger.debug("Exiting prepare_lnurl_pay (error)")
             raise
 
+    def _prepare_lnurl_pay(self, data: LnUrlPayRequestData, amount_sat: int, comment: Optional[str],
+                           validate_success_action_url: bool) -> PrepareLnUrlPayResponse:
+        """Builds the LNURL-Pay request and returns the SDK PrepareLnUrlPayResponse object."""
+        # Handle amount format for PayAmount
+        pay_amount = PayAmount.BITCOIN(amount_sat)
+
+        req = PrepareLnUrlPayRequest(
+             data=data, # Use the passed object
+             amount=pay_amount,
+             comment=comment,
+             validate_success_action_url=validate_success_action_url,
+             bip353_address=getattr(data, 'bip353_address', None) # Get bip353_address from the object
+        )
+        return self.instance.prepare_lnurl_pay(req)
+
     # Refined signature to expect the SDK object
     def lnurl_pay(self, prepare_response: PrepareLnUrlPayResponse) -> Optional[Dict[str, Any]]:
         """
@@ -866,16 +1162,8 @@ class PaymentHandler:
         """
         logger.debug("Entering lnurl_pay")
         try:
-            # Check if it's the correct type of SDK object
-            if not isinstance(prepare_response, PrepareLnUrlPayResponse):
-                 logger.error(f"lnurl_pay expects PrepareLnUrlPayResponse object, but received {type(prepare_response)}.")
-                 raise TypeError("lnurl_pay expects the SDK PrepareLnUrlPayResponse object")
-
-            req = LnUrlPayRequest(prepare_response=prepare_response) # Pass the actual object
-            result = self.instance.lnurl_pay(req)
-            result_dict = result.__dict__ if result else None # Result type depends on success action
-            logger.info("Executed LNURL-Pay.")
-            logger.debug(f"LNURL-Pay result: {result_dict}")
+            _require_sdk_type(prepare_response, PrepareLnUrlPayResponse, 'lnurl_pay')
+            result_dict = self._lnurl_pay(prepare_response)
             logger.debug("Exiting lnurl_pay")
             return result_dict
         except Exception as e:
@@ -883,6 +1171,44 @@ class PaymentHandler:
             logger.debug("Exiting lnurl_pay (error)")
             raise
 
+    def _lnurl_pay(self, prepare_response: PrepareLnUrlPayResponse) -> Optional[Dict[str, Any]]:
+        """Executes a prepared LNURL-Pay payment; callers handle error logging."""
+        req = LnUrlPayRequest(prepare_response=prepare_response) # Pass the actual object
+        result = self.instance.lnurl_pay(req)
+        result_dict = result.__dict__ if result else None # Result type depends on success action
+        logger.info("Executed LNURL-Pay.")
+        logger.debug("LNURL-Pay result: %s", result_dict)
+        return result_dict
+
+    def lnurl_pay_oneshot(self, data: LnUrlPayRequestData, amount_sat: int, comment: Optional[str] = None, validate_success_action_url: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Prepares and executes an LNURL-Pay payment in one call, for callers that do
+        not need to show the fees first. Use prepare_lnurl_pay/lnurl_pay otherwise.
+
+        Args:
+            data: The LnUrlPayRequestData object from a parsed LNURL_PAY input's .data attribute.
+            amount_sat: Amount in satoshis.
+            comment: Optional comment.
+            validate_success_action_url: Whether to validate the success action URL.
+        Returns:
+            Dictionary with payment result details, or None if no specific result.
+        Raises:
+            TypeError: If data is not the correct object type.
+            Exception: For any SDK errors.
+        """
+        logger.debug("Entering lnurl_pay_oneshot (amount=%s, comment=%s)", amount_sat, comment)
+        try:
+            _require_sdk_type(data, LnUrlPayRequestData, 'lnurl_pay_oneshot')
+            prepare_res = self._prepare_lnurl_pay(data, amount_sat, comment, validate_success_action_url)
+            logger.info(f"Prepared LNURL-Pay. Fees: {prepare_res.fees_sat} sat.")
+            result_dict = self._lnurl_pay(prepare_res)
+            logger.debug("Exiting lnurl_pay_oneshot")
+            return result_dict
+        except Exception as e:
+            logger.error(f"Error executing LNURL-Pay: {e}")
+            logger.debug("Exiting lnurl_pay_oneshot (error)")
+            raise
+
     # Corrected type hint to LnUrlAuthRequestData
     def lnurl_auth(self, data: LnUrlAuthRequestData) -> bool:
         """
@@ -898,11 +1224,7 @@ class PaymentHandler:
         """
         logger.debug("Entering lnurl_auth")
         try:
-             # Check if it's the correct type of SDK object
-            if not isinstance(data, LnUrlAuthRequestData):
-                 logger.error(f"lnurl_auth expects LnUrlAuthRequestData object, but received {type(data)}.")
-                 raise TypeError("lnurl_auth expects the SDK LnUrlAuthRequestData object")
-
+            _require_sdk_type(data, LnUrlAuthRequestData, 'lnurl_auth')
             result = self.instance.lnurl_auth(data) # Pass the actual object
             is_ok = result.is_ok()
             if is_ok:
@@ -911,7 +1233,7 @@ class PaymentHandler:
                  # Log the error message from the result if available
                  error_msg = getattr(result, 'error', 'Unknown error')
                  logger.warning(f"LNURL-Auth failed. Error: {error_msg}")
-            logger.debug(f"LNURL-Auth result: {is_ok}")
+            logger.debug("LNURL-Auth result: %s", is_ok)
             logger.debug("Exiting lnurl_auth")
             return is_ok
         except Exception as e:
@@ -934,17 +1256,11 @@ class PaymentHandler:
             TypeError: If data is not the correct object type.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering lnurl_withdraw (amount_msat={amount_msat}, comment={comment})")
+        logger.debug("Entering lnurl_withdraw (amount_msat=%s, comment=%s)", amount_msat, comment)
         try:
-            # Check if it's the correct type of SDK object
-            if not isinstance(data, LnUrlWithdrawRequestData):
-                 logger.error(f"lnurl_withdraw expects LnUrlWithdrawRequestData object, but received {type(data)}.")
-                 raise TypeError("lnurl_withdraw expects the SDK LnUrlWithdrawRequestData object")
-
+            _require_sdk_type(data, LnUrlWithdrawRequestData, 'lnurl_withdraw')
             # Basic validation for amount and comment
-            if not isinstance(amount_msat, int) or amount_msat <= 0:
-                 logger.warning(f"Invalid amount_msat provided: {amount_msat}")
-                 raise ValueError("amount_msat must be a positive integer.")
+            _require_positive_int(amount_msat, 'amount_msat')
             if comment is not None and not isinstance(comment, str):
                  logger.warning(f"Invalid comment type provided: {type(comment)}")
                  raise ValueError("comment must be a string or None.")
@@ -952,7 +1268,7 @@ class PaymentHandler:
             result = self.instance.lnurl_withdraw(data, amount_msat, comment) # Pass the actual object
             result_dict = result.__dict__ if result else None # Check result type
             logger.info("Executed LNURL-Withdraw.")
-            logger.debug(f"LNURL-Withdraw result: {result_dict}")
+            logger.debug("LNURL-Withdraw result: %s", result_dict)
             logger.debug("Exiting lnurl_withdraw")
             return result_dict
         except Exception as e:
@@ -977,30 +1293,12 @@ class PaymentHandler:
             ValueError: If amount is missing for non-drain payment.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering prepare_pay_onchain (amount={amount_sat}, drain={drain}, fee_rate={fee_rate_sat_per_vbyte})")
+        logger.debug("Entering prepare_pay_onchain (amount=%s, drain=%s, fee_rate=%s)", amount_sat, drain, fee_rate_sat_per_vbyte)
         try:
-            # Determine amount object based on inputs
-            if drain:
-                amount_obj = PayAmount.DRAIN
-                logger.debug("Preparing onchain payment using DRAIN amount.")
-            elif amount_sat is not None:
-                amount_obj = PayAmount.BITCOIN(amount_sat)
-                logger.debug(f"Preparing onchain payment with amount: {amount_sat} sat.")
-            else:
-                 logger.warning("Amount is missing for non-drain pay onchain.")
-                 raise ValueError("Amount must be provided for non-drain payments.")
-
-            # Optional fee rate validation
-            if fee_rate_sat_per_vbyte is not None and (not isinstance(fee_rate_sat_per_vbyte, int) or fee_rate_sat_per_vbyte <= 0):
-                 logger.warning(f"Invalid fee_rate_sat_per_vbyte provided: {fee_rate_sat_per_vbyte}")
-                 raise ValueError("fee_rate_sat_per_vbyte must be a positive integer or None.")
-
-
-            req = PreparePayOnchainRequest(amount=amount_obj, fee_rate_sat_per_vbyte=fee_rate_sat_per_vbyte)
-            prepare_res = self.instance.prepare_pay_onchain(req)
-            prepare_res_dict = prepare_res.__dict__
+            prepare_res = self._prepare_pay_onchain(amount_sat, drain, fee_rate_sat_per_vbyte)
+            prepare_res_dict = dict(vars(prepare_res))  # Copy, so callers cannot mutate the SDK object
             logger.info(f"Prepared pay onchain. Total fees: {prepare_res.total_fees_sat} sat.")
-            logger.debug(f"PreparePayOnchainRequest response: {prepare_res_dict}")
+            logger.debug("PreparePayOnchainRequest response: %s", prepare_res_dict)
             logger.debug("Exiting prepare_pay_onchain")
             return prepare_res_dict
         except Exception as e:
@@ -1008,6 +1306,35 @@ class PaymentHandler:
             logger.debug("Exiting prepare_pay_onchain (error)")
             raise
 
+    def _prepare_pay_onchain(self, amount_sat: Optional[int], drain: bool,
+                             fee_rate_sat_per_vbyte: Optional[int]) -> PreparePayOnchainResponse:
+        """Validates the amount and fee rate and returns the SDK PreparePayOnchainResponse object."""
+        # Determine amount object based on inputs
+        if drain:
+            amount_obj = _PAY_AMOUNT_DRAIN
+            logger.debug("Preparing onchain payment using DRAIN amount.")
+        elif amount_sat is not None:
+            amount_obj = PayAmount.BITCOIN(amount_sat)
+            logger.debug("Preparing onchain payment with amount: %s sat.", amount_sat)
+        else:
+             logger.warning("Amount is missing for non-drain pay onchain.")
+             raise ValueError("Amount must be provided for non-drain payments.")
+
+        # Optional fee rate validation
+        if fee_rate_sat_per_vbyte is not None:
+            _require_positive_int(fee_rate_sat_per_vbyte, 'fee_rate_sat_per_vbyte')
+
+        req = PreparePayOnchainRequest(amount=amount_obj, fee_rate_sat_per_vbyte=fee_rate_sat_per_vbyte)
+        return self.instance.prepare_pay_onchain(req)
+
+    @staticmethod
+    def _check_onchain_address(address: str):
+        """Raises ValueError if the destination address is not a non-empty string."""
+        # Basic check for address format (could add more robust validation)
+        if not isinstance(address, str) or not address:
+             logger.warning("Invalid or empty destination address provided for pay_onchain.")
+             raise ValueError("Destination address must be a non-empty string.")
+
     # Refined signature to expect the SDK object
     def pay_onchain(self, address: str, prepare_response: PreparePayOnchainResponse):
         """
@@ -1021,22 +1348,11 @@ class PaymentHandler:
             ValueError: If address is invalid.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering pay_onchain to {address}")
+        logger.debug("Entering pay_onchain to %s", address)
         try:
-             # Check if it's the correct type of SDK object
-            if not isinstance(prepare_response, PreparePayOnchainResponse):
-                 logger.error(f"pay_onchain expects PreparePayOnchainResponse object, but received {type(prepare_response)}.")
-                 raise TypeError("pay_onchain expects the SDK PreparePayOnchainResponse object")
-
-            # Basic check for address format (could add more robust validation)
-            if not isinstance(address, str) or not address:
-                 logger.warning("Invalid or empty destination address provided for pay_onchain.")
-                 raise ValueError("Destination address must be a non-empty string.")
-
-
-            req = PayOnchainRequest(address=address, prepare_response=prepare_response) # Pass the actual object
-            self.instance.pay_onchain(req)
-            logger.info(f"Onchain payment initiated to {address}.")
+            _require_sdk_type(prepare_response, PreparePayOnchainResponse, 'pay_onchain')
+            self._check_onchain_address(address)
+            self._pay_onchain(address, prepare_response)
             logger.debug("Exiting pay_onchain")
 
             # Note: Onchain payments might not trigger an immediate SDK event like lightning payments
@@ -1047,7 +1363,41 @@ class PaymentHandler:
             logger.debug("Exiting pay_onchain (error)")
             raise
 
+    def _pay_onchain(self, address: str, prepare_response: PreparePayOnchainResponse):
+        """Executes a prepared onchain payment; callers validate the address and handle error logging."""
+        req = PayOnchainRequest(address=address, prepare_response=prepare_response) # Pass the actual object
+        self.instance.pay_onchain(req)
+        logger.info(f"Onchain payment initiated to {address}.")
+
+    def pay_onchain_oneshot(self, address: str, amount_sat: Optional[int] = None, drain: bool = False, fee_rate_sat_per_vbyte: Optional[int] = None):
+        """
+        Prepares and executes an onchain payment in one call, for callers that do not
+        need to show the fees first. Use prepare_pay_onchain/pay_onchain otherwise.
+
+        Args:
+            address: The destination Bitcoin address string.
+            amount_sat: Optional amount in satoshis (required unless drain is True).
+            drain: If True, sends all funds.
+            fee_rate_sat_per_vbyte: Optional custom fee rate.
+        Raises:
+            ValueError: If address is invalid or amount is missing for non-drain payment.
+            Exception: For any SDK errors.
+        """
+        logger.debug("Entering pay_onchain_oneshot to %s (amount=%s, drain=%s, fee_rate=%s)", address, amount_sat, drain, fee_rate_sat_per_vbyte)
+        try:
+            # Check the address before preparing, so a bad address does not waste an SDK call
+            self._check_onchain_address(address)
+            prepare_res = self._prepare_pay_onchain(amount_sat, drain, fee_rate_sat_per_vbyte)
+            logger.info(f"Prepared pay onchain. Total fees: {prepare_res.total_fees_sat} sat.")
+            self._pay_onchain(address, prepare_res)
+            logger.debug("Exiting pay_onchain_oneshot")
+        except Exception as e:
+            logger.error(f"Error executing pay onchain to {address}: {e}")
+            logger.debug("Exiting pay_onchain_oneshot (error)")
+            raise
+
     # list_refundable_payments method (already present, returns list of RefundableSwap objects)
+    @_log_sdk_errors("listing refundable payments")
     def list_refundable_payments(self) -> List[RefundableSwap]:
          """
          Lists refundable onchain swaps.
@@ -1058,16 +1408,10 @@ class PaymentHandler:
              Exception: For any SDK errors.
          """
          logger.debug("Entering list_refundable_payments")
-         try:
-             refundable_payments = self.instance.list_refundables()
-             logger.debug(f"Found {len(refundable_payments)} refundable payments.")
-             logger.debug("Exiting list_refundable_payments")
-             return refundable_payments # Return the list of objects directly
-
-         except Exception as e:
-             logger.error(f"Error listing refundable payments: {e}")
-             logger.debug("Exiting list_refundable_payments (error)")
-             raise
+         refundable_payments = self.instance.list_refundables()
+         logger.debug("Found %s refundable payments.", len(refundable_payments))
+         logger.debug("Exiting list_refundable_payments")
+         return refundable_payments # Return the list of objects directly
 
     # Updated signature and type hint to RefundableSwap and explicit refund_address
     def execute_refund(self, refundable_swap: RefundableSwap, refund_address: str, fee_rate_sat_per_vbyte: int):
@@ -1084,30 +1428,25 @@ class PaymentHandler:
             Exception: For any SDK errors.
         """
         # Using getattr with a default for logging in case refundable_swap is None or malformed (though type hint should prevent this)
-        logger.debug(f"Entering execute_refund for swap {getattr(refundable_swap, 'swap_address', 'N/A')} to {refund_address} with fee rate {fee_rate_sat_per_vbyte}")
+        swap_address = getattr(refundable_swap, 'swap_address', 'N/A')
+        logger.debug("Entering execute_refund for swap %s to %s with fee rate %s", swap_address, refund_address, fee_rate_sat_per_vbyte)
         try:
-            # Check if it's the correct type of SDK object
-            if not isinstance(refundable_swap, RefundableSwap):
-                 logger.error(f"execute_refund expects RefundableSwap object, but received {type(refundable_swap)}.")
-                 raise TypeError("execute_refund expects the SDK RefundableSwap object")
-
+            _require_sdk_type(refundable_swap, RefundableSwap, 'execute_refund')
             # Basic check for refund_address format (could add more robust validation)
             if not isinstance(refund_address, str) or not refund_address:
                  logger.warning("Invalid or empty refund_address provided for execute_refund.")
                  raise ValueError("Refund destination address must be a non-empty string.")
 
-            if not isinstance(fee_rate_sat_per_vbyte, int) or fee_rate_sat_per_vbyte <= 0:
-                 logger.warning(f"Invalid fee_rate_sat_per_vbyte provided: {fee_rate_sat_per_vbyte}")
-                 raise ValueError("fee_rate_sat_per_vbyte must be a positive integer.")
+            _require_positive_int(fee_rate_sat_per_vbyte, 'fee_rate_sat_per_vbyte')
 
 
             req = RefundRequest(
-                swap_address=refundable_swap.swap_address, # Use address from the object
+                swap_address=swap_address, # Use address from the object
                 refund_address=refund_address,
                 fee_rate_sat_per_vbyte=fee_rate_sat_per_vbyte
             )
             self.instance.refund(req)
-            logger.info(f"Refund initiated for swap {refundable_swap.swap_address} to {refund_address}.")
+            logger.info(f"Refund initiated for swap {swap_address} to {refund_address}.")
             logger.debug("Exiting execute_refund")
 
             # Note: Onchain refunds might not trigger an immediate SDK event
@@ -1115,11 +1454,12 @@ class PaymentHandler:
 
 
         except Exception as e:
-            logger.error(f"Error executing refund for swap {getattr(refundable_swap, 'swap_address', 'N/A')}: {e}")
+            logger.error(f"Error executing refund for swap {swap_address}: {e}")
             logger.debug("Exiting execute_refund (error)")
             raise
 
     # rescan_swaps method (already present)
+    @_log_sdk_errors("rescanning swaps")
     def rescan_swaps(self):
          """
          Rescans onchain swaps.
@@ -1128,16 +1468,11 @@ class PaymentHandler:
              Exception: For any SDK errors.
          """
          logger.debug("Entering rescan_swaps")
-         try:
-             self.instance.rescan_onchain_swaps()
-             logger.info("Onchain swaps rescan initiated.")
-             logger.debug("Exiting rescan_swaps")
-
-         except Exception as e:
-             logger.error(f"Error rescanning swaps: {e}")
-             logger.debug("Exiting rescan_swaps (error)")
-             raise
+         self.instance.rescan_onchain_swaps()
+         logger.info("Onchain swaps rescan initiated.")
+         logger.debug("Exiting rescan_swaps")
 
+    @_log_sdk_errors("fetching recommended fees")
     def recommended_fees(self) -> Dict[str, int]:
         """
         Fetches recommended transaction fees.
@@ -1148,73 +1483,85 @@ class PaymentHandler:
             Exception: For any SDK errors.
         """
         logger.debug("Entering recommended_fees")
-        try:
-            fees = self.instance.recommended_fees()
-            # Assuming recommended_fees returns an object with __dict__ or similar fee structure
-            fees_dict = fees.__dict__ if fees else {} # Convert to dict
-            logger.debug(f"Fetched recommended fees: {fees_dict}")
-            logger.debug("Exiting recommended_fees")
-            return fees_dict
-        except Exception as e:
-            logger.error(f"Error fetching recommended fees: {e}")
-            logger.debug("Exiting recommended_fees (error)")
-            raise
+        fees = self.instance.recommended_fees()
+        # Assuming recommended_fees returns an object with __dict__ or similar fee structure
+        fees_dict = fees.__dict__ if fees else {} # Convert to dict
+        logger.debug("Fetched recommended fees: %s", fees_dict)
+        logger.debug("Exiting recommended_fees")
+        return fees_dict
 
     def handle_payments_waiting_fee_acceptance(self):
         """
         Fetches and automatically accepts payments waiting for fee acceptance.
         In a real app, you would add logic to decide whether to accept the fees.
+        Returns without querying the SDK if no payment entered WAITING_FEE_ACCEPTANCE
+        since the previous check.
 
         Raises:
              Exception: For any SDK errors.
         """
         logger.debug("Entering handle_payments_waiting_fee_acceptance")
+        if not self.listener.take_waiting_fee_flag():
+            logger.debug("Exiting handle_payments_waiting_fee_acceptance (no new waiting payments)")
+            return
         try:
             logger.info("Checking for payments waiting for fee acceptance...")
             # Filter for WAITING_FEE_ACCEPTANCE state
             payments_waiting = self.instance.list_payments(
-                ListPaymentsRequest(states=[PaymentState.WAITING_FEE_ACCEPTANCE])
+                ListPaymentsRequest(states=list(_WAITING_FEE_STATES))
             )
 
-            handled_count = 0
+            swap_ids = []
+            bitcoin_details = PaymentDetails.BITCOIN
             for payment in payments_waiting:
                 # Double-check payment type and swap_id as per doc example
-                if not isinstance(payment.details, PaymentDetails.BITCOIN) or not payment.details.swap_id:
+                details = payment.details
+                if not isinstance(details, bitcoin_details) or not details.swap_id:
                     logger.warning(f"Skipping payment in WAITING_FEE_ACCEPTANCE state without Bitcoin details or swap_id: {getattr(payment, 'destination', 'N/A')}")
                     continue
 
-                swap_id = payment.details.swap_id
-                logger.info(f"Found payment waiting fee acceptance: {getattr(payment, 'destination', 'N/A')} (Swap ID: {swap_id})")
-
-                fetch_fees_req = FetchPaymentProposedFeesRequest(swap_id=swap_id)
-                fetch_fees_response = self.instance.fetch_payment_proposed_fees(fetch_fees_req)
-
-                logger.info(
-                    f"Payer sent {fetch_fees_response.payer_amount_sat} "
-                    f"and currently proposed fees are {fetch_fees_response.fees_sat}"
-                )
+                logger.info(f"Found payment waiting fee acceptance: {getattr(payment, 'destination', 'N/A')} (Swap ID: {details.swap_id})")
+                swap_ids.append(details.swap_id)
 
-                # --- Decision Point: Accept Fees? ---
-                # In a real application, you would implement logic here to decide if the proposed fees
-                # are acceptable based on your application's criteria.
-                # For this example, we will automatically accept.
-                logger.info(f"Automatically accepting proposed fees for swap {swap_id}.")
-                # --- End Decision Point ---
-
-                accept_fees_req = AcceptPaymentProposedFeesRequest(response=fetch_fees_response)
-                self.instance.accept_payment_proposed_fees(accept_fees_req)
-                logger.info(f"Accepted proposed fees for swap {swap_id}.")
-                handled_count += 1
+            handled_count = 0
+            if swap_ids:
+                # Each swap needs two sequential SDK round trips; run the swaps concurrently.
+                # SDK calls go through the native layer, which releases the GIL.
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(swap_ids))) as executor:
+                    for _ in executor.map(self._accept_proposed_fees, swap_ids):
+                        handled_count += 1
 
             logger.info(f"Finished checking for payments waiting fee acceptance. Handled {handled_count}.")
             logger.debug("Exiting handle_payments_waiting_fee_acceptance")
 
         except Exception as e:
             logger.error(f"Error handling payments waiting fee acceptance: {e}")
+            self.listener.mark_waiting_fee()
             logger.debug("Exiting handle_payments_waiting_fee_acceptance (error)")
             raise
 
 
+    def _accept_proposed_fees(self, swap_id: str):
+        """Fetches and accepts the proposed fees for a single swap waiting fee acceptance."""
+        fetch_fees_req = FetchPaymentProposedFeesRequest(swap_id=swap_id)
+        fetch_fees_response = self.instance.fetch_payment_proposed_fees(fetch_fees_req)
+
+        logger.info(
+            f"Payer sent {fetch_fees_response.payer_amount_sat} "
+            f"and currently proposed fees are {fetch_fees_response.fees_sat}"
+        )
+
+        # --- Decision Point: Accept Fees? ---
+        # In a real application, you would implement logic here to decide if the proposed fees
+        # are acceptable based on your application's criteria.
+        # For this example, we will automatically accept.
+        logger.info(f"Automatically accepting proposed fees for swap {swap_id}.")
+        # --- End Decision Point ---
+
+        accept_fees_req = AcceptPaymentProposedFeesRequest(response=fetch_fees_response)
+        self.instance.accept_payment_proposed_fees(accept_fees_req)
+        logger.info(f"Accepted proposed fees for swap {swap_id}.")
+
     # --- Working with Non-Bitcoin Assets ---
     # Asset Metadata configuration is done in __init__
 
@@ -1222,33 +1569,39 @@ class PaymentHandler:
 
     # prepare_send_payment_asset is covered by the updated send_payment with asset_id parameter
 
-    def fetch_asset_balance(self) -> Dict[str, Any]:
+    def fetch_asset_balance(self) -> List[Dict[str, Any]]:
         """
         Fetches the balance of all assets (Bitcoin and others).
-        Note: This information is part of get_info().
+        Note: This information is part of get_info(). The result is reused for up to
+        5 seconds unless an SDK event (payment update or sync) arrives in between.
 
         Returns:
-            Dictionary containing asset balances.
+            List of asset balance dictionaries, freshly copied on every call.
         Raises:
             Exception: For any SDK errors from get_info.
         """
         logger.debug("Entering fetch_asset_balance")
+        # Read before fetching so an event arriving mid-fetch invalidates the result
+        event_count = self.listener.event_count
+        cached = self._asset_balances_cache
+        if cached is not None and cached[0] == event_count and cached[1] > time.monotonic():
+            logger.debug("Exiting fetch_asset_balance (cached)")
+            return _copy_rows(cached[2])
         try:
             # This information is part of get_info().wallet_info.asset_balances
             # Calling get_info handles sync and error logging
             info = self.get_info()
             # Extract asset_balances from the returned info dictionary
-            asset_balances = info.get('wallet_info', {}).get('asset_balances', {})
+            asset_balances = info.get('wallet_info', {}).get('asset_balances') or ()
 
-            # The asset_balances value is a list of AssetBalance objects.
-            # You might want to convert these to dictionaries too for consistency if needed.
-            # For now, returning the list of objects as is fetched by get_info.
-            # If conversion is needed:
-            # converted_balances = [bal.__dict__ for bal in asset_balances]
+            # The asset_balances value is a list of AssetBalance objects; copy them into
+            # dictionaries so neither the cache nor the SDK objects are handed out
+            converted_balances = [dict(vars(bal)) for bal in asset_balances]
 
-            logger.debug(f"Fetched asset balances: {asset_balances}")
+            logger.debug("Fetched asset balances: %s", converted_balances)
+            self._asset_balances_cache = (event_count, time.monotonic() + self._ASSET_BALANCES_TTL, converted_balances)
             logger.debug("Exiting fetch_asset_balance")
-            return asset_balances # Or return converted_balances
+            return _copy_rows(converted_balances)
 
         except Exception as e:
              # get_info already logs, this catch is mainly to ensure debug exit logging
@@ -1269,10 +1622,10 @@ class PaymentHandler:
             ValueError: If webhook_url is invalid.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering register_webhook with URL: {webhook_url}")
+        logger.debug("Entering register_webhook with URL: %s", webhook_url)
         try:
             # Basic URL format validation (can be made more robust)
-            if not isinstance(webhook_url, str) or not webhook_url.startswith('https://'):
+            if not isinstance(webhook_url, str) or not _HTTPS_URL_RE.match(webhook_url):
                  logger.warning(f"Invalid webhook_url provided: {webhook_url}")
                  raise ValueError("Webhook URL must be a valid HTTPS URL.")
 
@@ -1284,6 +1637,7 @@ class PaymentHandler:
             logger.debug("Exiting register_webhook (error)")
             raise
 
+    @_log_sdk_errors("unregistering webhook")
     def unregister_webhook(self):
         """
         Unregisters the currently registered webhook.
@@ -1292,14 +1646,9 @@ class PaymentHandler:
             Exception: For any SDK errors.
         """
         logger.debug("Entering unregister_webhook")
-        try:
-            self.instance.unregister_webhook()
-            logger.info("Webhook unregistered.")
-            logger.debug("Exiting unregister_webhook")
-        except Exception as e:
-            logger.error(f"Error unregistering webhook: {e}")
-            logger.debug("Exiting unregister_webhook (error)")
-            raise
+        self.instance.unregister_webhook()
+        logger.info("Webhook unregistered.")
+        logger.debug("Exiting unregister_webhook")
 
     # --- Utilities and Message Signing ---
     # parse_input is implemented above
@@ -1317,7 +1666,7 @@ class PaymentHandler:
             Exception: For any SDK errors.
         """
         # Log truncated message to avoid logging potentially sensitive full messages
-        logger.debug(f"Entering sign_message with message (truncated): {message[:50]}...")
+        logger.debug("Entering sign_message with message (truncated): %.50s...", message)
         try:
             if not isinstance(message, str) or not message:
                  logger.warning("Invalid or empty message provided for signing.")
@@ -1325,10 +1674,10 @@ class PaymentHandler:
 
             req = SignMessageRequest(message=message)
             sign_res = self.instance.sign_message(req)
-            # Fetch info AFTER signing to get the pubkey that was used
-            info = self.instance.get_info()
-
-            pubkey = info.wallet_info.pubkey if info and info.wallet_info else None
+            if self._cached_pubkey is None:
+                info = self.instance.get_info()
+                self._cached_pubkey = info.wallet_info.pubkey if info and info.wallet_info else None
+            pubkey = self._cached_pubkey
 
             if not pubkey:
                  logger.warning("Could not retrieve wallet pubkey after signing message.")
@@ -1363,7 +1712,7 @@ class PaymentHandler:
             ValueError: If message, pubkey, or signature are invalid.
             Exception: For any SDK errors.
         """
-        logger.debug(f"Entering check_message for message (truncated): {message[:50]}...")
+        logger.debug("Entering check_message for message (truncated): %.50s...", message)
         try:
             if not isinstance(message, str) or not message:
                  logger.warning("Invalid or empty message provided for checking.")
@@ -1392,6 +1741,7 @@ class PaymentHandler:
     # Payment Limits
     # Keeping the explicit fetch methods as they are clearer
 
+    @_log_sdk_errors("fetching lightning limits")
     def fetch_lightning_limits(self) -> Dict[str, Any]:
         """
         Fetches current Lightning payment limits.
@@ -1402,20 +1752,16 @@ class PaymentHandler:
              Exception: For any SDK errors.
         """
         logger.debug("Entering fetch_lightning_limits")
-        try:
-            limits = self.instance.fetch_lightning_limits()
-            limits_dict = {
-                'receive': limits.receive.__dict__ if limits.receive else None,
-                'send': limits.send.__dict__ if limits.send else None,
-            }
-            logger.debug(f"Fetched lightning limits: {limits_dict}")
-            logger.debug("Exiting fetch_lightning_limits")
-            return limits_dict
-        except Exception as e:
-            logger.error(f"Error fetching lightning limits: {e}")
-            logger.debug("Exiting fetch_lightning_limits (error)")
-            raise
-
+        limits = self.instance.fetch_lightning_limits()
+        limits_dict = {
+            'receive': _limits_to_dict(limits.receive),
+            'send': _limits_to_dict(limits.send),
+        }
+        logger.debug("Fetched lightning limits: %s", limits_dict)
+        logger.debug("Exiting fetch_lightning_limits")
+        return limits_dict
+
+    @_log_sdk_errors("fetching onchain limits")
     def fetch_onchain_limits(self) -> Dict[str, Any]:
         """
         Fetches current onchain payment limits (used for Bitcoin send/receive).
@@ -1426,28 +1772,95 @@ class PaymentHandler:
              Exception: For any SDK errors.
         """
         logger.debug("Entering fetch_onchain_limits")
-        try:
-            limits = self.instance.fetch_onchain_limits()
-            limits_dict = {
-                'receive': limits.receive.__dict__ if limits.receive else None,
-                'send': limits.send.__dict__ if limits.send else None,
+        limits = self.instance.fetch_onchain_limits()
+        limits_dict = {
+            'receive': _limits_to_dict(limits.receive),
+            'send': _limits_to_dict(limits.send),
+        }
+        logger.debug("Fetched onchain limits: %s", limits_dict)
+        logger.debug("Exiting fetch_onchain_limits")
+        return limits_dict
+
+    def fetch_screen_bundle(self) -> Dict[str, Any]:
+        """
+        Fetches recommended fees, onchain limits and fiat rates in parallel, for callers
+        that need all three at once (e.g. a send screen). The calls are independent
+        network requests, so the total wait is that of the slowest one.
+
+        Returns:
+            Dictionary with 'recommended_fees', 'onchain_limits' and 'fiat_rates', in the
+            same shapes as the individual methods return.
+        Raises:
+             Exception: For any SDK errors from the individual calls, which log them.
+        """
+        logger.debug("Entering fetch_screen_bundle")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            fees_future = executor.submit(self.recommended_fees)
+            limits_future = executor.submit(self.fetch_onchain_limits)
+            rates_future = executor.submit(self.fetch_fiat_rates)
+            bundle = {
+                'recommended_fees': fees_future.result(),
+                'onchain_limits': limits_future.result(),
+                'fiat_rates': rates_future.result(),
             }
-            logger.debug(f"Fetched onchain limits: {limits_dict}")
-            logger.debug("Exiting fetch_onchain_limits")
-            return limits_dict
-        except Exception as e:
-            logger.error(f"Error fetching onchain limits: {e}")
-            logger.debug("Exiting fetch_onchain_limits (error)")
-            raise
+        logger.debug("Exiting fetch_screen_bundle")
+        return bundle
+
+    def _payment_to_dict(self, payment, include_details: bool = True) -> Dict[str, Any]:
+        """
+        Converts an SDK Payment object to the dictionary shape returned by the API.
+        The recursive details conversion is skipped when include_details is False.
+        """
+        timestamp, amount_sat, fees_sat, payment_type, status, destination, tx_id = _get_payment_fields(payment)
+        details = getattr(payment, 'details', None)
+        return {
+            'id': getattr(payment, 'id', None), # Payments might have an ID? Check SDK docs
+            'timestamp': timestamp,
+            'amount_sat': amount_sat,
+            'fees_sat': fees_sat,
+            'payment_type': payment_type.name, # Enum member name, e.g. 'RECEIVE'
+            'status': status.name, # Enum member name, e.g. 'COMPLETE'
+            'details': self.sdk_to_dict(details) if details and include_details else None, # Include details dict
+            'destination': destination, # Optional field
+            'tx_id': tx_id, # Optional field
+            'payment_hash': getattr(details, 'payment_hash', None), # Often useful, from details
+            'swap_id': getattr(details, 'swap_id', None), # Often useful, from details
+        }
 
     def sdk_to_dict(self, obj):
-        if isinstance(obj, (str, int, float, bool, type(None))):
-            return obj
-        if isinstance(obj, list):
-            return [self.sdk_to_dict(i) for i in obj]
-        if hasattr(obj, '__dict__'):
-            return {k: self.sdk_to_dict(v) for k, v in obj.__dict__.items()}
-        return str(obj)  # fallback
+        return _sdk_to_dict(obj)
+
+    def _try_lookup(self, builder, payment_identifier: str, label: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a payment through one GetPaymentRequest variant and formats it for check_payment_status.
+
+        Args:
+            builder: GetPaymentRequest variant used to build the request (PAYMENT_HASH or SWAP_ID).
+            payment_identifier: Identifier passed to the builder.
+            label: Lookup name used in the debug log on failure.
+        Returns:
+            Payment status dictionary, or None if the lookup failed or found nothing.
+        """
+        try:
+            payment = self.instance.get_payment(builder(payment_identifier))
+            if payment:
+                # Bare state name as in list_payments (e.g. 'PENDING'), with COMPLETE reported as SUCCEEDED
+                status = payment.status.name
+                status = _SDK_STATUS_ALIASES.get(status, status)
+                # Update our internal tracking
+                self.listener.record_status(payment_identifier, status)
+
+                return {
+                    'status': status,
+                    'payment_details': self.sdk_to_dict(payment),
+                    'error': None if status not in ['FAILED'] else 'Payment failed',
+                    'timestamp': payment.timestamp,
+                    'amount_sat': payment.amount_sat,
+                    'fees_sat': payment.fees_sat
+                }
+        except Exception as e:
+            logger.debug("%s lookup failed: %s", label, e)
+        return None
 
     def check_payment_status(self, payment_identifier: str) -> Dict[str, Any]:
         """
@@ -1475,66 +1888,24 @@ class PaymentHandler:
             - amount_sat: Payment amount in satoshis
             - fees_sat: Payment fees in satoshis
         """
-        logger.debug(f"Checking payment status for identifier: {payment_identifier}")
+        logger.debug("Checking payment status for identifier: %s", payment_identifier)
         try:
             if not isinstance(payment_identifier, str) or not payment_identifier:
                 raise ValueError("Invalid payment identifier")
 
-            # Always try to get fresh SDK status first for new payments
-            payment = None
-            try:
-                payment = self.instance.get_payment(GetPaymentRequest.PAYMENT_HASH(payment_identifier))
-                if payment:
-                    status = str(payment.status)
-                    # Update our internal tracking
-                    self.listener.payment_statuses[payment_identifier] = status
-                    # If payment is in a final state, add to paid list if successful
-                    if status in ['WAITING_CONFIRMATION', 'SUCCEEDED']:
-                        if payment_identifier not in self.listener.paid:
-                            self.listener.paid.append(payment_identifier)
-                            logger.info(f"Payment {payment_identifier} marked as paid (status: {status})")
-                    
-                    return {
-                        'status': status,
-                        'payment_details': self.sdk_to_dict(payment),
-                        'error': None if status not in ['FAILED'] else 'Payment failed',
-                        'timestamp': payment.timestamp,
-                        'amount_sat': payment.amount_sat,
-                        'fees_sat': payment.fees_sat
-                    }
-            except Exception as e:
-                logger.debug(f"Payment hash lookup failed: {str(e)}")
-
-            # Try swap ID lookup if payment hash lookup failed
-            try:
-                payment = self.instance.get_payment(GetPaymentRequest.SWAP_ID(payment_identifier))
-                if payment:
-                    status = str(payment.status)
-                    # Update our internal tracking
-                    self.listener.payment_statuses[payment_identifier] = status
-                    # If payment is in a final state, add to paid list if successful
-                    if status in ['WAITING_CONFIRMATION', 'SUCCEEDED']:
-                        if payment_identifier not in self.listener.paid:
-                            self.listener.paid.append(payment_identifier)
-                            logger.info(f"Payment {payment_identifier} marked as paid (status: {status})")
-                    
-                    return {
-                        'status': status,
-                        'payment_details': self.sdk_to_dict(payment),
-                        'error': None if status not in ['FAILED'] else 'Payment failed',
-                        'timestamp': payment.timestamp,
-                        'amount_sat': payment.amount_sat,
-                        'fees_sat': payment.fees_sat
-                    }
-            except Exception as e:
-                logger.debug(f"Swap ID lookup failed: {str(e)}")
+            # Always try to get fresh SDK status first for new payments,
+            # by payment hash and then by swap ID
+            for builder, label in _PAYMENT_LOOKUPS:
+                result = self._try_lookup(builder, payment_identifier, label)
+                if result:
+                    return result
 
             # If we couldn't get fresh status, check our internal state
             # This helps with payments we've seen before but might temporarily fail to fetch
             if payment_identifier in self.listener.paid:
-                logger.debug(f"Found payment in internal paid list: {payment_identifier}")
+                logger.debug("Found payment in internal paid set: %s", payment_identifier)
                 return {
-                    'status': 'SUCCEEDED',  # We consider it succeeded if it was in paid list
+                    'status': 'SUCCEEDED',  # We consider it succeeded if it was in paid set
                     'payment_details': None,
                     'error': None,
                     'timestamp': None,
@@ -1545,7 +1916,7 @@ class PaymentHandler:
             # Check cached status as last resort
             cached_status = self.listener.get_payment_status(payment_identifier)
             if cached_status:
-                logger.debug(f"Using cached status: {cached_status}")
+                logger.debug("Using cached status: %s", cached_status)
                 return {
                     'status': cached_status,
                     'payment_details': None,
@@ -1556,7 +1927,7 @@ class PaymentHandler:
                 }
 
             # If we get here, we couldn't find the payment
-            logger.debug(f"No payment found for identifier: {payment_identifier}")
+            logger.debug("No payment found for identifier: %s", payment_identifier)
             return {
                 'status': 'UNKNOWN',
                 'payment_details': None,
@@ -1584,26 +1955,24 @@ class PaymentHandler:
             ValueError: If specified currency is not found
             Exception: For any SDK errors
         """
-        logger.debug(f"Entering get_exchange_rate for currency: {currency}")
+        logger.debug("Entering get_exchange_rate for currency: %s", currency)
         try:
-            rates = self.instance.fetch_fiat_rates()
-            rates_dict = {}
-            
-            # Convert rates to dictionary
-            for rate in rates:
-                rates_dict[rate.coin] = rate.value
-
+            # Served from the fetch_fiat_rates cache when fresh
+            rates = self.fetch_fiat_rates()
             if currency:
+                # Single currency: stop at the first match instead of building the full map
                 currency = currency.upper()
-                if currency not in rates_dict:
+                rate = next((r['value'] for r in rates if r['coin'] == currency), None)
+                if rate is None:
                     logger.warning(f"Requested currency {currency} not found in available rates")
                     raise ValueError(f"Exchange rate not available for currency: {currency}")
-                logger.info(f"Found exchange rate for {currency}: {rates_dict[currency]}")
+                logger.info(f"Found exchange rate for {currency}: {rate}")
                 return {
                     'currency': currency,
-                    'rate': rates_dict[currency]
+                    'rate': rate
                 }
-            
+
+            rates_dict = {rate['coin']: rate['value'] for rate in rates}
             logger.info(f"Returning all exchange rates for {len(rates_dict)} currencies")
             return rates_dict
 